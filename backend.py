@@ -0,0 +1,2665 @@
+import os
+import re
+import io
+import csv
+import sys
+import json
+import math
+import socket
+import threading
+import unicodedata
+import shutil
+import zipfile
+import uuid
+import time
+import argparse
+import urllib.request
+import urllib.error
+import atexit
+import zlib
+import gzip
+import heapq
+import bisect
+import signal
+import traceback  # 🔥 ডিবাগিং এর জন্য ইম্পোর্ট করা হলো
+from collections import OrderedDict, deque
+from contextlib import contextmanager
+from datetime import datetime
+from flask import Flask, request, jsonify, Response, stream_with_context
+from werkzeug.exceptions import BadRequest, HTTPException, RequestEntityTooLarge
+from werkzeug.wsgi import get_input_stream
+from werkzeug.serving import make_server
+
+# Kivy ছাড়াও (হেডলেস সার্ভার/রেপ্লিকা) এই মডিউল চলতে পারে
+try:
+    from kivy.utils import platform
+except ImportError:
+    platform = "android" if "ANDROID_ARGUMENT" in os.environ else sys.platform
+
+# brotli ইনস্টল থাকলে রেসপন্সে "br" ও দেওয়া হয়, না থাকলে শুধু gzip/deflate
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# ডিস্কে ডাটাবেস ফাইল কম্প্রেশন: lzma কিছু অ্যান্ড্রয়েড বিল্ডে থাকে না, zstd শুধু zstandard ইনস্টল থাকলে
+try:
+    import lzma
+except ImportError:
+    lzma = None
+
+# মাল্টি-প্রসেস সার্ভারে প্রসেসগুলোর মধ্যে ফাইল লক (Linux/macOS); উইন্ডোজে শুধু এক প্রসেস
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+# ==========================================
+# ২. ব্যাকেন্ড ইঞ্জিন (Backend)
+# ==========================================
+server = Flask(__name__)
+SERVER_THREAD_STARTED = False
+SERVER_ACTIVE = False
+CURRENT_USER = None
+
+# স্কিমা পরিবর্তনের পর পুরনো রো গুলো ব্যাকগ্রাউন্ডে আপডেট হবে কি না
+AUTO_BACKFILL = True
+BACKFILL_BATCH = 500
+
+# প্রতি ইউজারের ডিফল্ট লিমিট; auth ফাইলে ইউজারের "limits" দিয়ে বদলানো যায়
+DEFAULT_LIMITS = {"rate": 50, "burst": 100, "max_inflight": 8}
+WRITE_SLOTS = 8
+
+# চেঞ্জ ফিড: প্রতি টেবিলে কতগুলো ইভেন্ট মেমরিতে থাকবে, আর long-poll কতক্ষণ অপেক্ষা করবে
+CHANGE_FEED_SIZE = 1000
+LONG_POLL_TIMEOUT = 25
+# রেপ্লিকেশন: প্রতি ইউজারের সব টেবিলের মিউটেশন লগ (ফলোয়াররা এখান থেকে টানে)
+REPLICATION_LOG_SIZE = 10000
+
+# ডেল্টা সিঙ্কের জন্য প্রতি টেবিলে কতগুলো ডিলিট-চিহ্ন (tombstone) রাখা হবে
+TOMBSTONE_LIMIT = 1000
+# যেসব পরিবর্তনে কোনো রো বদলায় না: এগুলো ডাটা ভার্সন নয়, meta_version বাড়ায় (ডেল্টা কার্সর বাতিল হয় না)
+META_OPS = ("index", "ttl")
+
+# বাল্ক ইমপোর্ট: প্রতি চাঙ্কে কতগুলো রো একবারে লেখা হবে
+IMPORT_CHUNK = 5000
+IMPORT_CHUNK_MAX = 100000
+EXPORT_FORMATS = ("csv", "ndjson")
+
+# রাইট ডিউরেবিলিটি: "fsync" = প্রতি অপারেশনে fsync, "group" = প্রতি GROUP_COMMIT_MS এ একসাথে fsync,
+# "shutdown" = শুধু অ্যাপ পজ/বন্ধ হওয়ার সময় ফ্লাশ
+DURABILITY_MODE = "group"
+GROUP_COMMIT_MS = 20
+
+# রো TTL: কত সেকেন্ড পর পর মেয়াদোত্তীর্ণ রো মোছা হবে
+TTL_SWEEP_INTERVAL = 5
+
+# প্রতি ইউজার ফোল্ডারে ডাটাবেস/টেবিলের তালিকা, রো সংখ্যা ও সাইজ — লিস্টিং এর সময় ডাটা ফাইল খুলতে হয় না
+CATALOG_FILE = ".catalog.json"
+
+# নতুন ডাটাবেস ডিস্কে কীভাবে থাকবে: None = সাধারণ JSON, নাহলে STORAGE_CODECS এর একটি
+# (প্রতি ডাটাবেসে set_compression দিয়ে বদলানো যায়; ফাইল পড়ার সময় ফরম্যাট নিজেই চেনা হয়)
+STORAGE_COMPRESSION = None
+
+# HTTP কম্প্রেশন: এর চেয়ে ছোট রেসপন্স কম্প্রেস করা হয় না; লেভেল 1 (দ্রুত) - 9 (ছোট), 0 = বন্ধ
+COMPRESS_MIN_SIZE = 1024
+COMPRESS_LEVEL = 6
+# gzip করা রিকোয়েস্ট বডি খুলে সর্বোচ্চ কত বাইট হতে পারবে (zip bomb ঠেকাতে)
+MAX_INFLATED_BODY = 512 * 1024 * 1024
+
+def _to_number(v):
+    if isinstance(v, bool): return int(v)
+    if isinstance(v, (int, float)): return v
+    if isinstance(v, str):
+        try: return int(v)
+        except ValueError:
+            try: return float(v)
+            except ValueError: return None
+    return None
+
+def _compare_key(v):
+    # সংখ্যা আগে, তারপর টেক্সট — মিশ্র কলামেও min/max কাজ করে
+    n = _to_number(v)
+    return (0, n, "") if n is not None else (1, 0, str(v))
+
+def _ordered(a, b, op):
+    ka, kb = _compare_key(a), _compare_key(b)
+    return ka[0] == kb[0] and op(ka, kb)
+
+WHERE_OPS = {
+    "eq": lambda a, b: _compare_key(a) == _compare_key(b),
+    "ne": lambda a, b: _compare_key(a) != _compare_key(b),
+    "gt": lambda a, b: _ordered(a, b, lambda x, y: x > y),
+    "gte": lambda a, b: _ordered(a, b, lambda x, y: x >= y),
+    "lt": lambda a, b: _ordered(a, b, lambda x, y: x < y),
+    "lte": lambda a, b: _ordered(a, b, lambda x, y: x <= y),
+    "in": lambda a, b: any(_compare_key(a) == _compare_key(x) for x in b),
+    "contains": lambda a, b: str(b).lower() in str(a).lower(),
+}
+
+def row_matches(row, where):
+    # where = {col: মান} (সমান) বা {col: {"gt": 5, "lte": 9}} (অপারেটর)
+    if not where: return True
+    for col, cond in where.items():
+        v = row.get(col)
+        if isinstance(cond, dict):
+            for op, arg in cond.items():
+                if op not in WHERE_OPS: raise ValueError(f"Unknown operator: {op}")
+                if v is None or not WHERE_OPS[op](v, arg): return False
+        elif v is None or _compare_key(v) != _compare_key(cond):
+            return False
+    return True
+
+COLUMN_TYPES = ("int", "float", "bool", "text", "datetime")
+BN_DIGITS = str.maketrans("০১২৩৪৫৬৭৮৯", "0123456789")
+TRUE_WORDS = ("true", "1", "yes", "y", "on", "হ্যাঁ")
+FALSE_WORDS = ("false", "0", "no", "n", "off", "না")
+DATETIME_FORMATS = ("%d/%m/%Y", "%d-%m-%Y", "%Y/%m/%d", "%d/%m/%Y %H:%M", "%d/%m/%Y %H:%M:%S")
+
+def parse_columns(cols, types=None):
+    # "name" / "name:type" থেকে (নামগুলো, {নাম: টাইপ}); id কলাম বাদ
+    names, typed = [], dict(types or {})
+    for spec in cols:
+        name, _, typ = str(spec).partition(":")
+        name, typ = name.strip(), typ.strip().lower()
+        if not name or name == "id": continue
+        if name.startswith("_"): raise ValueError(f"Column names starting with '_' are reserved: {name}")
+        if typ: typed[name] = typ
+        if name not in names: names.append(name)
+    typed = {n: t for n, t in typed.items() if n in names and t}
+    for n, t in typed.items():
+        if t not in COLUMN_TYPES: raise ValueError(f"Unknown type '{t}' for column '{n}'")
+    return names, typed
+
+def _parse_datetime(v):
+    if isinstance(v, (int, float)): return datetime.fromtimestamp(v)
+    v = v.strip()
+    try: return datetime.fromisoformat(v)
+    except ValueError: pass
+    for fmt in DATETIME_FORMATS:
+        try: return datetime.strptime(v, fmt)
+        except ValueError: pass
+    raise ValueError
+
+def coerce_value(typ, v):
+    if typ == "text": return v if isinstance(v, str) or v is None else str(v)
+    if isinstance(v, str):
+        v = v.translate(BN_DIGITS).strip()
+        if v == "": return None
+    if v is None: return None
+    try:
+        if typ == "int":
+            if isinstance(v, bool): return int(v)
+            n = v if isinstance(v, (int, float)) else float(v) if "." in v or "e" in v.lower() else int(v)
+            if isinstance(n, float) and not n.is_integer(): raise ValueError
+            return int(n)
+        if typ == "float":
+            return float(v)
+        if typ == "bool":
+            if isinstance(v, bool): return v
+            w = str(v).lower()
+            if w in TRUE_WORDS: return True
+            if w in FALSE_WORDS: return False
+            raise ValueError
+        if typ == "datetime":
+            return _parse_datetime(v).isoformat()
+    except (ValueError, TypeError, OverflowError, OSError):
+        pass
+    raise ValueError(f"expects {typ}, got {v!r}")
+
+# একটি ফিল্ডে সার্ভার-সাইড অ্যাটমিক অপারেশন; পুরো রো ক্লায়েন্টে এনে update করতে হয় না
+FIELD_OPS = ("incr", "decr", "append", "cas")
+_UNSET = object()
+
+def _number_or_none(v):
+    return _to_number(v.translate(BN_DIGITS).strip() if isinstance(v, str) else v)
+
+def apply_field_op(op, current, value, typ=None):
+    # অ্যাটমিক অপারেশনের পর ফিল্ডের নতুন মান; মানের সাথে না মিললে ValueError
+    if op in ("incr", "decr"):
+        delta = _number_or_none(1 if value is None else value)
+        base = 0 if current in (None, "") else _number_or_none(current)
+        if delta is None: raise ValueError(f"{op} needs a number, got {value!r}")
+        if base is None: raise ValueError(f"current value {current!r} is not a number")
+        new = base + delta if op == "incr" else base - delta
+    elif op == "append":
+        new = ("" if current is None else str(current)) + ("" if value is None else str(value))
+    else:
+        new = value
+    return new if typ is None else coerce_value(typ, new)
+
+def same_value(current, expected, typ=None):
+    # ক্লায়েন্ট "5" পাঠাক বা 5, টাইপ করা কলামে আগে একই রূপে আনা হয়
+    if typ is not None:
+        try: expected = coerce_value(typ, expected)
+        except ValueError: return False
+    return current == expected or (current is not None and expected is not None and str(current) == str(expected))
+
+def coerce_row(table_data, row):
+    # টাইপ করা কলামগুলো জমা রাখার রূপে এনে রো এর কপি ফেরত দেয়
+    # "_" দিয়ে শুরু হওয়া কী গুলো ইঞ্জিনের নিজস্ব মেটাডাটা, ক্লায়েন্ট সেট করতে পারে না
+    out = {k: v for k, v in row.items() if not str(k).startswith("_")}
+    types = table_data.get("types")
+    if not types: return out
+    for col, typ in types.items():
+        if col in out:
+            try: out[col] = coerce_value(typ, out[col])
+            except ValueError as e: raise ValueError(f"Column '{col}' {e}") from None
+    return out
+
+def row_expiry(table_data, row, now=None):
+    # টেবিলের TTL অনুযায়ী রো কখন মেয়াদোত্তীর্ণ হবে (epoch সেকেন্ড); কখনো না হলে None
+    ttl = table_data.get("ttl")
+    if not ttl: return None
+    base = time.time() if now is None else now
+    col = ttl.get("column")
+    if col:
+        v = row.get(col)
+        if v is None or v == "": return None
+        try: base = float(v) if isinstance(v, (int, float)) else _parse_datetime(str(v).translate(BN_DIGITS)).timestamp()
+        except (ValueError, TypeError, OverflowError, OSError): raise ValueError(f"TTL column '{col}' is not a time: {v}") from None
+    return base + ttl.get("seconds", 0)
+
+def stamp_expiry(table_data, row):
+    exp = row_expiry(table_data, row)
+    if exp is not None: row["_exp"] = exp
+    return row
+
+def is_expired(row, now):
+    exp = row.get("_exp")
+    return exp is not None and exp <= now
+
+# নাম -> (compress, decompress); কোনো কোডেক না থাকলেও ম্যাজিক বাইট দিয়ে অন্তত চেনা যায় ফাইলটা কী
+# (JSON সবসময় "{" দিয়ে শুরু, তাই কোনো ম্যাজিকের সাথে মেলে না)
+STORAGE_MAGIC = {"lzma": b"\xfd7zXZ\x00", "zstd": b"\x28\xb5\x2f\xfd", "zlib": b"\x78"}
+STORAGE_CODECS = {"zlib": (lambda b: zlib.compress(b, 6), zlib.decompress)}
+if lzma: STORAGE_CODECS["lzma"] = (lambda b: lzma.compress(b, preset=1), lzma.decompress)
+if zstandard: STORAGE_CODECS["zstd"] = (lambda b: zstandard.ZstdCompressor(level=3).compress(b), lambda b: zstandard.ZstdDecompressor().decompress(b))
+
+def storage_codec(head):
+    # ফাইলের প্রথম বাইট দেখে কোন কোডেকে লেখা (None = সাধারণ JSON)
+    for name, magic in STORAGE_MAGIC.items():
+        if head.startswith(magic): return name
+    return None
+
+def pack_doc(d):
+    # যে ডিভাইসে কোডেকটা নেই (যেমন zstd ছাড়া রেপ্লিকা), সেখানে সাধারণ JSON লেখা হয়
+    codec = STORAGE_CODECS.get(d.get("compression"))
+    # সাধারণ ফাইল আগের মতোই indent করা JSON; কম্প্রেসড ফাইলে indent শুধু বাড়তি কাজ
+    if not codec: return json.dumps(d, indent=4).encode()
+    return codec[0](json.dumps(d, separators=(",", ":")).encode())
+
+def unpack_doc(raw):
+    name = storage_codec(raw[:8])
+    if name is None: return json.loads(raw)
+    if name not in STORAGE_CODECS: raise ValueError(f"Database file is {name} compressed but {name} is not available here")
+    return json.loads(STORAGE_CODECS[name][1](raw))
+
+def split_renames(cols):
+    # "old->new[:type]" কে "new[:type]" বানায়, সাথে {old: new} ম্যাপ
+    out, renames = [], {}
+    for spec in cols:
+        old, arrow, rest = str(spec).partition("->")
+        if arrow:
+            new = rest.partition(":")[0].strip()
+            if old.strip() and new: renames[old.strip()] = new
+            out.append(rest)
+        else:
+            out.append(spec)
+    return out, renames
+
+def upgrade_row(table_data, row):
+    # রো যে মাইগ্রেশনগুলো এখনো দেখেনি সেগুলো চালায়; দরকার হলে নতুন কপি ফেরত দেয়
+    version = table_data.get("schema_version", 0)
+    if row.get("_v", 0) >= version: return row
+    row = dict(row)
+    for m in table_data.get("migrations", []):
+        if m["v"] <= row.get("_v", 0): continue
+        if m["op"] == "add":
+            row.setdefault(m["col"], m.get("default"))
+        elif m["op"] == "drop":
+            row.pop(m["col"], None)
+        elif m["op"] == "rename" and m["from"] in row:
+            row[m["to"]] = row.pop(m["from"])
+    row["_v"] = version
+    return row
+
+# বাংলা অক্ষর, কার-চিহ্ন, হসন্ত ও নুক্তা সহ পুরো ব্লক; দাঁড়ি (।) শব্দ আলাদা করে
+TOKEN_RE = re.compile(r"[\w\u0980-\u09FF]+")
+SEARCH_NORMALIZE = str.maketrans({"\u200c": None, "\u200d": None, "\u09ce": "\u09a4\u09cd"})
+
+def tokenize(text):
+    # NFC, ছোট হাতের অক্ষর আর বাংলা অঙ্ক এক করে শব্দে ভাগ করে
+    text = unicodedata.normalize("NFC", str(text)).translate(SEARCH_NORMALIZE).translate(BN_DIGITS).casefold()
+    return TOKEN_RE.findall(text)
+
+class SearchIndex:
+    # টেবিলের টেক্সট কলামের ইনভার্টেড ইনডেক্স, BM25 দিয়ে র‍্যাঙ্ক
+    K1, B = 1.2, 0.75
+
+    def __init__(self, columns):
+        self.columns = columns
+        self.postings = {}
+        self.lengths = {}
+        self.row_terms = {}
+        self.expires = {}
+        self.total = 0
+        # id -> রো, যাতে ফলাফলের রো আনতে টেবিল স্ক্যান না লাগে
+        self.rows = {}
+        # প্রিফিক্স খোঁজার জন্য সাজানো শব্দ তালিকা; নতুন শব্দ fresh এ জমে পরের সার্চে একবারে মেশে
+        # (মুছে যাওয়া শব্দ তালিকায় থেকে যেতে পারে, postings এ না থাকলে বাদ পড়ে)
+        self.vocab = []
+        self.fresh = []
+
+    def _terms(self, row):
+        terms = {}
+        for col in self.columns:
+            v = row.get(col)
+            if v is None: continue
+            for tok in tokenize(v): terms[tok] = terms.get(tok, 0) + 1
+        return terms
+
+    def add(self, row_id, row):
+        self.remove(row_id)
+        terms = self._terms(row)
+        for tok, tf in terms.items():
+            p = self.postings.get(tok)
+            if p is None:
+                p = self.postings[tok] = {}
+                self.fresh.append(tok)
+            p[row_id] = tf
+        self.rows[row_id] = row
+        self.row_terms[row_id] = list(terms)
+        self.lengths[row_id] = n = sum(terms.values())
+        self.total += n
+        if row.get("_exp") is not None: self.expires[row_id] = row["_exp"]
+
+    def remove(self, row_id):
+        if row_id not in self.lengths: return
+        self.expires.pop(row_id, None)
+        del self.rows[row_id]
+        self.total -= self.lengths.pop(row_id)
+        for tok in self.row_terms.pop(row_id):
+            p = self.postings[tok]
+            del p[row_id]
+            if not p: del self.postings[tok]
+
+    def _prefixed(self, prefix):
+        if len(self.vocab) > 2 * len(self.postings) + 64: self.vocab, self.fresh = sorted(self.postings), []
+        elif self.fresh: self.vocab, self.fresh = sorted(self.vocab + self.fresh), []
+        out = set()
+        for i in range(bisect.bisect_left(self.vocab, prefix), len(self.vocab)):
+            term = self.vocab[i]
+            if not term.startswith(prefix): break
+            if term in self.postings: out.add(term)
+        return out
+
+    def search(self, query, limit=20):
+        toks = tokenize(query)
+        if not toks or not self.lengths: return []
+        # শেষ শব্দটা আংশিক হতে পারে (টাইপ করার সময়), তাই সেটার প্রিফিক্স মিলানো হয়
+        terms = set(toks[:-1]) | self._prefixed(toks[-1])
+        n, avg = len(self.lengths), self.total / len(self.lengths) or 1
+        scores, now = {}, time.time()
+        for term in terms:
+            p = self.postings.get(term)
+            if not p: continue
+            idf = math.log(1 + (n - len(p) + 0.5) / (len(p) + 0.5))
+            for rid, tf in p.items():
+                if self.expires.get(rid, now + 1) <= now: continue
+                norm = tf * (self.K1 + 1) / (tf + self.K1 * (1 - self.B + self.B * self.lengths[rid] / avg))
+                scores[rid] = scores.get(rid, 0) + idf * norm
+        return sorted(scores.items(), key=lambda x: -x[1])[:limit]
+
+class HashIndex:
+    # এক কলামের সমতা ইনডেক্স: মান -> {row_id: row}, কমিট ইভেন্ট থেকে হালনাগাদ
+    def __init__(self, column):
+        self.column = column
+        self.buckets = {}
+        self.row_keys = {}
+
+    @staticmethod
+    def key(v):
+        # 5, "5" ও "৫" একই কী — WHERE এর eq এর মতোই; ফাঁকা মান কোনো কিছুর সাথে মেলে না
+        return None if v is None or v == "" else _compare_key(v)
+
+    def add(self, row_id, row):
+        self.remove(row_id)
+        k = self.key(row.get(self.column))
+        if k is None: return
+        self.buckets.setdefault(k, {})[row_id] = row
+        self.row_keys[row_id] = k
+
+    def remove(self, row_id):
+        k = self.row_keys.pop(row_id, None)
+        if k is None: return
+        b = self.buckets[k]
+        del b[row_id]
+        if not b: del self.buckets[k]
+
+    def get(self, v):
+        k = self.key(v)
+        return () if k is None else self.buckets.get(k, {}).values()
+
+def iter_csv(stream):
+    # বাইনারি স্ট্রিম থেকে প্রতি CSV লাইনে একটা ডিক্ট, হেডার রো কী হিসেবে
+    text = io.TextIOWrapper(stream, encoding="utf-8-sig", newline="")
+    for rec in csv.DictReader(text):
+        yield {k.strip(): v for k, v in rec.items() if k}
+
+class RecordError(ValueError):
+    # পার্স না হওয়া সোর্স রেকর্ড; ইমপোর্টার সেটা রিপোর্ট করে বাকিগুলো চালিয়ে যায়
+    pass
+
+def iter_ndjson(stream):
+    text = io.TextIOWrapper(stream, encoding="utf-8")
+    for n, line in enumerate(text, 1):
+        line = line.strip()
+        if not line: continue
+        # ভুল লাইনে raise করলে জেনারেটর থেমে যায়, তাই এরর টাও একটা রেকর্ড হিসেবে পাঠানো হয়
+        try: rec = json.loads(line)
+        except ValueError as e:
+            yield RecordError(f"Line {n}: {e}")
+            continue
+        yield rec if isinstance(rec, dict) else RecordError(f"Line {n}: expected a JSON object")
+
+def detect_format(fmt=None, filename=""):
+    fmt = (fmt or "").lower() or os.path.splitext(filename)[1].lstrip(".").lower()
+    if fmt in ("jsonl", "json"): fmt = "ndjson"
+    if fmt not in EXPORT_FORMATS: raise ValueError(f"Unsupported format: {fmt or '?'} (use csv or ndjson)")
+    return fmt
+
+AGG_FUNCS = ("count", "sum", "avg", "min", "max")
+
+def _parse_aggs(aggs):
+    specs = []
+    for a in aggs or ["count"]:
+        if isinstance(a, str): a = {"fn": a}
+        fn, col = a.get("fn"), a.get("col")
+        if fn not in AGG_FUNCS: raise ValueError(f"Unknown aggregate: {fn}")
+        if fn != "count" and not col: raise ValueError(f"'{fn}' needs a column")
+        specs.append((a.get("as") or (f"{fn}_{col}" if col else fn), fn, col))
+    return specs
+
+class _FlushTicket:
+    # গ্রুপ মোডে একটি কমিট: ফাইল ডিস্কে গেলে (বা না গেলে) লেখককে জানানো হয়
+    def __init__(self, events):
+        self.events = events
+        self.done = threading.Event()
+        self.error = None
+
+class WriteCoalescer:
+    # ডার্টি ফাইলগুলো জমিয়ে প্রতি ব্যাচে একবার লেখে; কখন ডিস্কে যাবে আর wait() কখন ফিরবে সেটা ডিউরেবিলিটি মোড ঠিক করে
+    MODES = ("fsync", "group", "shutdown")
+
+    def __init__(self, flush_fn, lock_fn, done_fn, mode=DURABILITY_MODE, interval_ms=GROUP_COMMIT_MS):
+        self.flush_fn, self.lock_fn, self.done_fn = flush_fn, lock_fn, done_fn
+        self.cond = threading.Condition()
+        # ডিস্কে যাওয়ার অপেক্ষায় থাকা ফাইল: path -> [_FlushTicket] (shutdown মোডে খালি লিস্ট)
+        self.pending = {}
+        self.thread = None
+        self.configure(mode, interval_ms)
+
+    def configure(self, mode, interval_ms=None):
+        if mode not in self.MODES: raise ValueError(f"Unknown durability mode: {mode}")
+        self.mode = mode
+        if interval_ms is not None: self.interval = max(0, interval_ms) / 1000.0
+        if mode == "group" and not self.thread:
+            self.thread = threading.Thread(target=self._run, daemon=True)
+            self.thread.start()
+        print(f"DEBUG: Durability mode set to {mode} ({int(self.interval * 1000)} ms)")
+
+    def submit(self, path, events):
+        # পাথ লক ধরে রাখা অবস্থায় কল করা হয়; fsync মোডে ব্যর্থ হলে এক্সেপশন সরাসরি লেখকের কাছে যায়
+        if self.mode == "fsync":
+            self.flush_fn(path, True)
+            return None
+        with self.cond:
+            tickets = self.pending.setdefault(path, [])
+            if self.mode != "group": return None
+            ticket = _FlushTicket(events)
+            tickets.append(ticket)
+            self.cond.notify()
+            return ticket
+
+    def wait(self, ticket):
+        if ticket is None: return
+        ticket.done.wait()
+        if ticket.error: raise IOError(f"Group commit failed: {ticket.error}")
+
+    def _write_path(self, path, fsync):
+        # টিকিট নেওয়া হয় পাথ লকের ভেতরে: ডকে তখন ঠিক এই টিকিটগুলোর পরিবর্তনই আছে,
+        # তাই লেখা ব্যর্থ হলে এদের সবাইকে বাতিল করলে অন্য কোনো লেখকের রাইট হারায় না
+        with self.lock_fn(path):
+            with self.cond: tickets = self.pending.pop(path, [])
+            error = None
+            try: self.flush_fn(path, fsync)
+            except Exception as e:
+                print(f"DEBUG ERROR: Flush failed for {path}: {e}")
+                error = e
+                # কেউ অপেক্ষায় না থাকলে (shutdown মোডের আগেই জানানো রাইট) পরিবর্তন রেখে পরের ফ্লাশে আবার চেষ্টা
+                if not tickets:
+                    with self.cond: self.pending.setdefault(path, [])
+            self.done_fn(path, tickets, error)
+        for ticket in tickets:
+            ticket.error = error
+            ticket.done.set()
+
+    def _write_pending(self, fsync):
+        with self.cond: paths = list(self.pending)
+        for path in paths: self._write_path(path, fsync)
+
+    def _run(self):
+        while True:
+            with self.cond:
+                while self.mode != "group" or not self.pending: self.cond.wait()
+            time.sleep(self.interval)
+            self._write_pending(True)
+
+    def flush(self):
+        # বাকি সব লিখে fsync করে (pause/shutdown এ)
+        self._write_pending(True)
+
+class TokenBucket:
+    def __init__(self, rate, burst):
+        self.rate, self.burst = float(rate), float(burst)
+        self.tokens = self.burst
+        self.stamp = time.monotonic()
+
+    def take(self, cost=1.0):
+        # 0 মানে এগোনো যাবে, নইলে কত সেকেন্ড পর যাবে
+        now = time.monotonic()
+        self.tokens = min(self.burst, self.tokens + (now - self.stamp) * self.rate)
+        self.stamp = now
+        if self.tokens >= cost:
+            self.tokens -= cost
+            return 0
+        return (cost - self.tokens) / self.rate if self.rate > 0 else 60
+
+class TenantLimiter:
+    # প্রতি uid এর টোকেন বাকেট আর একসাথে চলা রিকোয়েস্টের সীমা
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.tenants = {}
+
+    def _state(self, user_obj):
+        limits = dict(DEFAULT_LIMITS, **(user_obj.get("limits") or {}))
+        st = self.tenants.get(user_obj["uid"])
+        if st is None or st["limits"] != limits:
+            st = self.tenants[user_obj["uid"]] = {"limits": limits, "bucket": TokenBucket(limits["rate"], limits["burst"]), "inflight": st["inflight"] if st else 0}
+        return st
+
+    def acquire(self, user_obj):
+        with self.lock:
+            st = self._state(user_obj)
+            if st["inflight"] >= st["limits"]["max_inflight"]: return False, 1, "Too many concurrent requests"
+            wait = st["bucket"].take()
+            if wait: return False, wait, "Rate limit exceeded"
+            st["inflight"] += 1
+            return True, 0, ""
+
+    def release(self, user_obj):
+        with self.lock:
+            st = self.tenants.get(user_obj["uid"])
+            if st: st["inflight"] -= 1
+
+class FairWriteQueue:
+    # রাইটের পালা টেন্যান্টদের মধ্যে round-robin এ, যাতে এক টেন্যান্টের জট বাকিদের আটকে না রাখে
+    def __init__(self, slots=WRITE_SLOTS):
+        self.slots = slots
+        self.active = 0
+        self.cond = threading.Condition()
+        self.queues = OrderedDict()
+
+    def _is_next(self, uid, ticket):
+        first = next(iter(self.queues))
+        return first == uid and self.queues[uid][0] is ticket
+
+    @contextmanager
+    def turn(self, uid):
+        ticket = object()
+        with self.cond:
+            self.queues.setdefault(uid, deque()).append(ticket)
+            while self.active >= self.slots or not self._is_next(uid, ticket): self.cond.wait()
+            # এই টেন্যান্টকে লাইনের শেষে পাঠানো হয় (round-robin)
+            q = self.queues.pop(uid)
+            q.popleft()
+            if q: self.queues[uid] = q
+            self.active += 1
+            self.cond.notify_all()
+        try:
+            yield
+        finally:
+            with self.cond:
+                self.active -= 1
+                self.cond.notify_all()
+
+class ChangeFeed:
+    # প্রতি (uid, db, table) এর রো পরিবর্তনের লগ, একটাই গ্লোবাল seq
+    # প্রসেস রিস্টার্টে seq আবার শুরু হয়, তাই উত্তরে epoch থাকে; অন্য epoch বা বাদ পড়া কার্সর পেলে resync
+    def __init__(self, size=CHANGE_FEED_SIZE):
+        self.size = size
+        self.cond = threading.Condition()
+        self.seq = 0
+        self.epoch = uuid.uuid4().hex
+        self.events = {}
+        self.evicted = {}
+
+    def _append(self, key, events, size):
+        q = self.events.get(key)
+        if q is None: q = self.events[key] = deque(maxlen=size)
+        overflow = len(q) + len(events) - q.maxlen
+        if overflow > 0: self.evicted[key] = (q[overflow - 1] if overflow <= len(q) else events[overflow - len(q) - 1])["seq"]
+        q.extend(events)
+
+    def publish(self, key, events):
+        # (uid, db, table) এ আর uid এর রেপ্লিকেশন লগে (কী (uid,)) ইভেন্ট যোগ করে
+        with self.cond:
+            for event in events:
+                self.seq += 1
+                event["seq"] = self.seq
+            self._append(key, events, self.size)
+            uid, db, table = key
+            self._append((uid,), [dict(ev, db=db, table=table) for ev in events], REPLICATION_LOG_SIZE)
+            self.cond.notify_all()
+
+    def _since(self, key, since, limit):
+        q = self.events.get(key, ())
+        if since > self.seq or since < self.evicted.get(key, 0): return None
+        out = [ev for ev in q if ev["seq"] > since]
+        return out[:limit]
+
+    def wait(self, key, since, epoch=None, timeout=LONG_POLL_TIMEOUT, limit=500):
+        # since এর পরের ইভেন্ট না আসা পর্যন্ত অপেক্ষা; (events, cursor, reset) ফেরত দেয়
+        with self.cond:
+            if since is None: since = self.seq
+            if epoch and epoch != self.epoch: return [], self.seq, True
+            deadline = time.monotonic() + timeout
+            while True:
+                evs = self._since(key, since, limit)
+                if evs is None: return [], self.seq, True
+                remaining = deadline - time.monotonic()
+                if evs or remaining <= 0: return evs, evs[-1]["seq"] if evs else since, False
+                self.cond.wait(remaining)
+
+class _WriteTxn:
+    def __init__(self, doc):
+        self.doc = doc
+        self.changed = False
+        self.events = []
+        self.undo = []
+
+    def commit(self): self.changed = True
+
+    def replace(self, rows, i, row):
+        # লিস্টের ঘর জায়গায় বদলালে রোলব্যাকে কেটে ফেলা যায় না, তাই পুরনো রো মনে রাখা হয়
+        self.undo.append((rows, i, rows[i]))
+        rows[i] = row
+
+    def emit(self, table, op, row_id=None, row=None, version=None):
+        ev = {"table": table, "op": op, "ts": time.time()}
+        t = self.doc["tables"].get(table)
+        if t is not None and op in META_OPS:
+            t["meta_version"] = ev["meta_version"] = t.get("meta_version", 0) + 1
+        elif t is not None:
+            # প্রতিটি পরিবর্তনে টেবিলের ভার্সন বাড়ে; রো তে লেখা থাকে কোন ভার্সনে সেটা শেষ বদলেছে
+            # (রেপ্লিকা প্রাইমারির ভার্সনটাই বসায়, যাতে দুই জায়গায় ডেল্টা সিঙ্ক একই থাকে)
+            t["version"] = ev["version"] = version if version is not None else t.get("version", 0) + 1
+            if row is not None: row["_ver"] = t["version"]
+            if op == "delete":
+                tomb = t.setdefault("tombstones", [])
+                tomb.append({"id": str(row_id), "_ver": t["version"]})
+                if len(tomb) > TOMBSTONE_LIMIT:
+                    t["sync_floor"] = tomb[-TOMBSTONE_LIMIT - 1]["_ver"]
+                    del tomb[:-TOMBSTONE_LIMIT]
+            elif op in ("create", "schema"):
+                # কলাম বদলালে পুরনো ডেল্টা আর অর্থবহ নয়; ক্লায়েন্টকে পুরো টেবিল নিতে হবে
+                t["sync_floor"] = t["version"]
+        if row_id is not None: ev["id"] = str(row_id)
+        # মেয়াদ (_exp) ইভেন্টে থাকে, যাতে রেপ্লিকা আর ক্লায়েন্টরাও মেয়াদোত্তীর্ণ রো লুকাতে পারে
+        if row is not None: ev["row"] = {k: v for k, v in row.items() if not k.startswith("_") or k == "_exp"}
+        self.events.append(ev)
+        self.changed = True
+
+class BackendEngine:
+    def __init__(self, base_dir=None):
+        print("DEBUG: Initializing BackendEngine...")
+        base_dir = os.path.abspath(base_dir or ".")
+        self.root = os.path.join(base_dir, "BanglaDB_Data")
+        self.auth_file = os.path.join(base_dir, "bangladb_users.json")
+        
+        # ইন-মেমরি ডকুমেন্ট ক্যাশ: প্রতিটি .json ফাইল একবারই পার্স হয়
+        self._docs = {}
+        self._dirty = set()
+        self._locks = {}
+        self._locks_guard = threading.Lock()
+        self.writer = WriteCoalescer(self._flush_path, self._lock_for, self._flushed)
+        self.feed = ChangeFeed()
+        self._search = {}
+        self._indexes = {}
+        # স্ন্যাপশটে আটকে থাকা রো লিস্ট: id(list) -> (পাঠকের সংখ্যা, list)
+        self._pins = {}
+        self._pins_guard = threading.Lock()
+        self._catalogs = {}
+        self._catalog_guard = threading.Lock()
+        # TTL: প্রতি টেবিলে মেয়াদ অনুযায়ী সাজানো হিপ (exp, id); রেপ্লিকায় expire_rows বন্ধ থাকে
+        self._expiry = {}
+        self._ttl_tables = set()
+        self._sweeper = None
+        self.expire_rows = True
+        # shared = একই ডাটা ফোল্ডার অন্য প্রসেসও লিখছে (serve --workers): রাইট ফাইল লকে হয়,
+        # লক ছাড়ার আগেই ডিস্কে যায়, আর ক্যাশ করা ডকুমেন্ট ফাইলের স্ট্যাম্প মিলিয়ে ব্যবহার হয়
+        self.shared = False
+        self._stamps = {}
+        self._flocks = {}
+        
+        if platform == 'android':
+            from android.storage import primary_external_storage_path
+            self.backup_dir = os.path.join(primary_external_storage_path(), "BanglaDB_Backups")
+        else:
+            self.backup_dir = os.path.join(base_dir, "BanglaDB_Backups")
+        
+        try:
+            if not os.path.exists(self.root): os.makedirs(self.root)
+            if not os.path.exists(self.backup_dir): os.makedirs(self.backup_dir)
+            print(f"DEBUG: Directories created/verified: {self.root}, {self.backup_dir}")
+        except Exception as e:
+            print(f"DEBUG ERROR: Failed to create directories: {e}")
+        
+        # User auth file initialization
+        try:
+            if not os.path.exists(self.auth_file):
+                with open(self.auth_file, 'w') as f: json.dump([], f)
+                print("DEBUG: Created new auth file.")
+            else:
+                try:
+                    with open(self.auth_file, 'r') as f:
+                        data = json.load(f)
+                        if isinstance(data, dict): 
+                             with open(self.auth_file, 'w') as f: json.dump([], f)
+                             print("DEBUG: Reset auth file (was dict, expected list).")
+                except:
+                     with open(self.auth_file, 'w') as f: json.dump([], f)
+                     print("DEBUG: Reset auth file (corrupted).")
+        except Exception as e:
+            print(f"DEBUG ERROR: Auth file init failed: {e}")
+
+    def register_user(self, user, password):
+        print(f"DEBUG: Registering user {user}")
+        try:
+            with open(self.auth_file, 'r') as f: users = json.load(f)
+            for u in users:
+                if u['user'] == user and u['pass'] == password:
+                    print("DEBUG: User already exists")
+                    return False, "This User+Password combination already exists!"
+            
+            unique_id = str(uuid.uuid4())
+            users.append({"user": user, "pass": password, "uid": unique_id})
+            with open(self.auth_file, 'w') as f: json.dump(users, f)
+            
+            user_folder = os.path.join(self.root, unique_id)
+            if not os.path.exists(user_folder): os.makedirs(user_folder)
+            
+            print("DEBUG: Registration success")
+            return True, "Success"
+        except Exception as e:
+            print(f"DEBUG ERROR: Register user failed: {e}")
+            return False, f"Error: {str(e)}"
+
+    def login_user(self, user, password):
+        print(f"DEBUG: Attempting login for {user}")
+        try:
+            with open(self.auth_file, 'r') as f: users = json.load(f)
+            for u in users:
+                if u['user'] == user and u['pass'] == password:
+                    global CURRENT_USER
+                    CURRENT_USER = u
+                    user_folder = os.path.join(self.root, u.get('uid'))
+                    if not os.path.exists(user_folder): os.makedirs(user_folder)
+                    print("DEBUG: Login success")
+                    return True, "Login Success!"
+            print("DEBUG: Login failed - Invalid credentials")
+            return False, "Invalid Credentials"
+        except Exception as e:
+            print(f"DEBUG ERROR: Login failed: {e}")
+            return False, f"Error: {str(e)}"
+
+    def get_user_path(self, target_user_dict=None):
+        user_info = target_user_dict if target_user_dict else CURRENT_USER
+        if user_info and 'uid' in user_info:
+            return os.path.join(self.root, user_info['uid'])
+        return self.root
+
+    # --- Storage Layer ---
+    def _db_path(self, db, user_obj=None):
+        return os.path.join(self.get_user_path(user_obj), f"{db}.json")
+
+    def _lock_for(self, path):
+        with self._locks_guard:
+            return self._locks.setdefault(path, threading.RLock())
+
+    @staticmethod
+    def _stamp(st):
+        # os.replace প্রতিবার নতুন inode দেয়, তাই অন্য প্রসেসের যেকোনো ফ্লাশ এতে ধরা পড়ে
+        return (st.st_ino, st.st_mtime_ns, st.st_size)
+
+    @contextmanager
+    def _process_lock(self, path):
+        # shared মোডে ডাটাবেসের লক ফাইলে exclusive flock (পাথ লক আগে থেকে ধরা থাকতে হবে)
+        if not self.shared:
+            yield
+            return
+        entry = self._flocks.get(path)
+        if entry is None:
+            lock_file = os.path.join(os.path.dirname(path), f".{os.path.basename(path)}.lock")
+            entry = self._flocks[path] = [os.open(lock_file, os.O_RDWR | os.O_CREAT, 0o644), 0]
+        # একই থ্রেডে নেস্টেড রাইট হলে লক একবারই নেওয়া/ছাড়া হয়
+        if entry[1] == 0: fcntl.flock(entry[0], fcntl.LOCK_EX)
+        entry[1] += 1
+        try: yield
+        finally:
+            entry[1] -= 1
+            if entry[1] == 0: fcntl.flock(entry[0], fcntl.LOCK_UN)
+
+    def _load(self, path):
+        d = self._docs.get(path)
+        if d is not None and self.shared and path not in self._dirty:
+            try: fresh = self._stamps.get(path) == self._stamp(os.stat(path))
+            except FileNotFoundError: fresh = False
+            if not fresh:
+                self._evict(path)
+                d = None
+        if d is None:
+            with open(path, 'rb') as f:
+                st = os.fstat(f.fileno())
+                d = unpack_doc(f.read())
+            self._docs[path] = d
+            self._stamps[path] = self._stamp(st)
+            for name, t in d["tables"].items():
+                if t.get("ttl"): self._track_ttl(path, name)
+        return d
+
+    @contextmanager
+    def _read(self, path):
+        with self._lock_for(path):
+            yield self._load(path)
+
+    @contextmanager
+    def _write(self, path):
+        ticket = None
+        with self._lock_for(path), self._process_lock(path):
+            doc = self._load(path)
+            # আগের কমিট এখনো ডিস্কে না গেলে (group/shutdown) ফাইল থেকে ফেরানো যায় না, তাই মেটাডাটার কপি রাখা হয়
+            saved = self._save_point(doc) if path in self._dirty else None
+            txn = _WriteTxn(doc)
+            try:
+                yield txn
+                if txn.changed:
+                    self._dirty.add(path)
+                    self._catalog_note(path, txn.doc)
+                    # অন্য প্রসেস ফাইল থেকেই পড়ে, তাই ফাইল লক ছাড়ার আগে লিখতে হয়
+                    if self.shared: self._flush_path(path, self.writer.mode != "shutdown")
+                    else: ticket = self.writer.submit(path, txn.events)
+            except BaseException:
+                # বডি বা ফ্লাশ যেখানেই ব্যর্থ হোক, পরিবর্তন ক্যাশে থেকে গেলে পরের কমিট সেটা ডিস্কে লিখে দিত
+                self._rollback(path, saved, txn)
+                raise
+            if txn.events:
+                self._index_events(path, txn.events)
+                # লকের ভেতরে পাবলিশ, যাতে ফিডের ক্রম আর আসল রাইটের ক্রম একই থাকে; group মোডে ফ্লাশের পরে ফ্লাশার পাবলিশ করে
+                if ticket is None: self._publish(path, txn.events)
+        # লক ছেড়ে দিয়ে অপেক্ষা, যাতে একই ব্যাচে অন্য রাইটগুলোও ঢুকতে পারে
+        self.writer.wait(ticket)
+
+    def _flushed(self, path, tickets, error):
+        # group মোড: ফাইল ডিস্কে পৌঁছালে তবেই ফিডে যায়; না পৌঁছালে অপেক্ষারত সব লেখক এরর পায়,
+        # তাই তাদের পরিবর্তনও ক্যাশ থেকে বাদ (নইলে রিট্রাই করলে ডুপ্লিকেট হত)
+        if error is None:
+            events = [ev for ticket in tickets for ev in ticket.events]
+            if events: self._publish(path, events)
+        elif tickets:
+            self._discard_unflushed(path)
+
+    @staticmethod
+    def _save_point(doc):
+        tables = {name: ({k: v if k == "rows" else (list(v) if isinstance(v, list) else dict(v) if isinstance(v, dict) else v) for k, v in t.items()}, len(t["rows"]))
+                  for name, t in doc["tables"].items()}
+        return {k: v for k, v in doc.items() if k != "tables"}, tables
+
+    def _rollback(self, path, saved, txn):
+        # ব্যর্থ ট্রানজ্যাকশনের মেমরির পরিবর্তন ফিরিয়ে নেয়, যাতে সেটা ডিস্কে না যায়
+        for rows, i, old in reversed(txn.undo): rows[i] = old
+        if saved is None:
+            # ফ্লাশ পর্যন্ত পৌঁছালে ক্যাটালগেও নতুন গণনা বসে গেছে, তাই ফাইল থেকে আবার পড়ে ঠিক করা হয়
+            if path in self._dirty: self._discard_unflushed(path)
+            else: self._evict(path)
+            return
+        meta, tables = saved
+        for t, n in tables.values():
+            # পুরো লিস্ট বদলালে সেভ পয়েন্টে পুরনো লিস্টটাই আছে; একই লিস্টে যোগ হওয়া রো কাটা হয়, জায়গায় বদল undo দিয়ে ফেরানো
+            del t["rows"][n:]
+        self._docs[path] = dict(meta, tables={name: t for name, (t, _) in tables.items()})
+        for cache in (self._search, self._indexes, self._expiry):
+            for key in [k for k in cache if k[0] == path]: del cache[key]
+        self._catalog_note(path, self._docs[path])
+        print(f"DEBUG: Rolled back failed write to {os.path.basename(path)}")
+
+    def _discard_unflushed(self, path):
+        # ডিস্কের ফাইলেই সব টেকসই কমিট আছে: ক্যাশ ফেলে দিয়ে সেখান থেকে আবার পড়া হয়
+        self._evict(path)
+        try:
+            with self._lock_for(path): self._catalog_note(path, self._load(path), os.stat(path))
+        except (OSError, ValueError) as e:
+            print(f"DEBUG ERROR: Could not reload {os.path.basename(path)}: {e}")
+        print(f"DEBUG: Discarded unflushed writes to {os.path.basename(path)}")
+
+    # --- Snapshots (MVCC) ---
+    def _freeze(self, path):
+        # সব টেবিলের বর্তমান ভার্সন পিন করে (view, feed_seq) দেয়; কাজ শেষে _release(view)
+        # view লাইভ রো লিস্ট শেয়ার করে, কিন্তু রো ডিক্ট জায়গায় বদলায় না আর রাইটার পিন করা লিস্ট আগে কপি করে (_own_rows), তাই লক ছাড়াই view স্থির থাকে
+        with self._lock_for(path):
+            tables = {}
+            for name, t in self._load(path)["tables"].items():
+                tables[name] = {k: v if k == "rows" else (list(v) if isinstance(v, list) else dict(v) if isinstance(v, dict) else v) for k, v in t.items()}
+                with self._pins_guard:
+                    n, _ = self._pins.get(id(t["rows"]), (0, None))
+                    self._pins[id(t["rows"])] = (n + 1, t["rows"])
+            view = {k: v for k, v in self._docs[path].items() if k != "tables"}
+            view["tables"] = tables
+            return view, self.feed.seq
+
+    def _release(self, view):
+        with self._pins_guard:
+            for t in view["tables"].values():
+                n, rows = self._pins[id(t["rows"])]
+                # শেষ পাঠক চলে গেলে পুরনো ভার্সন ছেড়ে দেওয়া হয় (রাইটার আবার সরাসরি লিখতে পারে)
+                if n > 1: self._pins[id(rows)] = (n - 1, rows)
+                else: del self._pins[id(rows)]
+
+    @contextmanager
+    def _snapshot(self, path):
+        view, _ = self._freeze(path)
+        try: yield view
+        finally: self._release(view)
+
+    def _own_rows(self, t):
+        # জায়গায় বদলানোর জন্য t["rows"]; কোনো স্ন্যাপশট সেটা পড়লে আগে কপি
+        rows = t["rows"]
+        if id(rows) in self._pins: rows = t["rows"] = list(rows)
+        return rows
+
+    def _publish_db_event(self, path, op):
+        uid = os.path.basename(os.path.dirname(path))
+        self.feed.publish((uid, os.path.basename(path)[:-len(".json")], None), [{"op": op, "ts": time.time()}])
+
+    def _index_events(self, path, events):
+        for ev in events:
+            key = (path, ev["table"])
+            if ev["op"] not in ("insert", "update", "delete"):
+                # স্কিমা বদলালে ইনডেক্স গুলো আবার প্রথম ব্যবহারে তৈরি হবে
+                self._search.pop(key, None)
+                self._indexes.pop(key, None)
+                self._expiry.pop(key, None)
+                continue
+            for idx in [self._search.get(key)] + list(self._indexes.get(key, {}).values()):
+                if idx is None: continue
+                if ev["op"] == "delete": idx.remove(ev["id"])
+                else: idx.add(ev["id"], ev["row"])
+            # হিপ থেকে পুরনো এন্ট্রি সরানো হয় না; সুইপার মোছার আগে রো এর বর্তমান _exp মিলিয়ে নেয়
+            heap = self._expiry.get(key)
+            if heap is not None and ev["op"] != "delete" and ev["row"].get("_exp") is not None:
+                heapq.heappush(heap, (ev["row"]["_exp"], ev["id"]))
+
+    def _publish(self, path, events):
+        uid = os.path.basename(os.path.dirname(path))
+        db = os.path.basename(path)[:-len(".json")]
+        by_table = {}
+        for ev in events: by_table.setdefault(ev.pop("table"), []).append(ev)
+        for table, evs in by_table.items(): self.feed.publish((uid, db, table), evs)
+
+    @staticmethod
+    def _atomic_write(path, payload, fsync):
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, 'wb' if isinstance(payload, bytes) else 'w') as f:
+            f.write(payload)
+            if fsync:
+                f.flush()
+                os.fsync(f.fileno())
+        os.replace(tmp, path)
+
+    def _flush_path(self, path, fsync=True):
+        with self._lock_for(path):
+            if path not in self._dirty: return
+            d = self._docs.get(path)
+            if d is not None:
+                self._atomic_write(path, pack_doc(d), fsync)
+                st = os.stat(path)
+                self._stamps[path] = self._stamp(st)
+                self._catalog_note(path, d, st)
+            self._dirty.discard(path)
+
+    # --- Catalog ---
+    @staticmethod
+    def _catalog_entry(d, st=None):
+        tables = {name: {"rows": len(t["rows"]), "columns": len(t["columns"]) - 1, "version": t.get("version", 0)} for name, t in d["tables"].items()}
+        return {"tables": tables, "bytes": st.st_size if st else 0, "mtime": st.st_mtime if st else time.time(), "compression": d.get("compression")}
+
+    def _catalog(self, user_path):
+        # ইউজার ফোল্ডারের ক্যাটালগ {db: {"tables", "bytes", "mtime"}}
+        # প্রসেসে একবার লোড হয়; ফাইলের size/mtime না মিললে (যেমন ফ্লাশ আর ক্যাটালগ লেখার মাঝে ক্র্যাশ) শুধু সেই ডাটাবেস আবার পার্স
+        with self._catalog_guard:
+            cat = self._catalogs.get(user_path)
+            # shared মোডে অন্য প্রসেসও ফাইল বদলায়, তাই প্রতিবার stat মিলিয়ে দেখা হয় (পার্স শুধু যেটা বদলেছে)
+            if cat is not None and not self.shared: return cat
+            if cat is None:
+                try:
+                    with open(os.path.join(user_path, CATALOG_FILE), 'r') as f: cat = json.load(f)
+                except (OSError, ValueError):
+                    cat = {}
+            found = {}
+            if os.path.isdir(user_path):
+                for entry in os.scandir(user_path):
+                    if entry.name.endswith('.json') and not entry.name.startswith('.'): found[entry.name[:-5]] = entry
+            stale = [db for db in cat if db not in found]
+            for db in stale: del cat[db]
+            for db, entry in found.items():
+                st = entry.stat()
+                old = cat.get(db)
+                if old and old.get("bytes") == st.st_size and old.get("mtime") == st.st_mtime: continue
+                try:
+                    # shared মোডে নিজের ক্যাশের ডক অন্য প্রসেসের লেখার চেয়ে পুরনো হতে পারে, তাই ফাইল থেকেই পড়া হয়;
+                    # stat একই fd থেকে, যাতে এন্ট্রির সাইজ/mtime ঠিক যে কনটেন্ট পড়া হল তার সাথে মেলে
+                    d = None if self.shared else self._docs.get(entry.path)
+                    if d is None:
+                        with open(entry.path, 'rb') as f:
+                            st = os.fstat(f.fileno())
+                            d = unpack_doc(f.read())
+                    cat[db] = self._catalog_entry(d, st)
+                    stale.append(db)
+                except Exception as e:
+                    print(f"DEBUG ERROR: Catalog could not read {entry.name}: {e}")
+            self._catalogs[user_path] = cat
+            if stale:
+                print(f"DEBUG: Catalog refreshed for {len(stale)} databases")
+                self._save_catalog(user_path)
+            return cat
+
+    def _save_catalog(self, user_path):
+        # ক্যাটালগ লগ নয়, ডাটা ফাইল থেকে আবার বানানো যায় — তাই fsync লাগে না
+        if os.path.isdir(user_path):
+            self._atomic_write(os.path.join(user_path, CATALOG_FILE), json.dumps(self._catalogs[user_path], ensure_ascii=False), False)
+
+    def _loaded_catalog(self, user_path):
+        # কমিট/ড্রপের পথে আবার scandir আর সব ফাইলের stat নয়; অন্য প্রসেসের বদল লিস্টিং এর সময় _catalog ধরে
+        with self._catalog_guard: cat = self._catalogs.get(user_path)
+        return cat if cat is not None else self._catalog(user_path)
+
+    def _catalog_note(self, path, d, st=None):
+        # এক ডাটাবেসের এন্ট্রি হালনাগাদ: কমিটে গণনা, ফ্লাশে size/mtime (আর ফাইল)
+        user_path, db = os.path.dirname(path), os.path.basename(path)[:-len(".json")]
+        cat = self._loaded_catalog(user_path)
+        with self._catalog_guard:
+            entry = self._catalog_entry(d, st)
+            if st is None and db in cat: entry["bytes"] = cat[db]["bytes"]
+            cat[db] = entry
+            if st is not None: self._save_catalog(user_path)
+
+    def _catalog_drop(self, path, new_path=None):
+        user_path, db = os.path.dirname(path), os.path.basename(path)[:-len(".json")]
+        cat = self._loaded_catalog(user_path)
+        with self._catalog_guard:
+            entry = cat.pop(db, None)
+            if new_path and entry: cat[os.path.basename(new_path)[:-len(".json")]] = entry
+            self._save_catalog(user_path)
+
+    def get_stats(self, db=None, user_obj=None):
+        # কোনো ডাটা ফাইল না খুলে ক্যাটালগ থেকে ইউজারের ডাটাবেসের তথ্য
+        cat = self._catalog(self.get_user_path(user_obj))
+        with self._catalog_guard:
+            cat = {name: dict(e, tables={t: dict(v) for t, v in e["tables"].items()}) for name, e in cat.items() if db is None or name == db}
+        return cat
+
+    def _evict(self, path):
+        with self._lock_for(path):
+            self._docs.pop(path, None)
+            self._dirty.discard(path)
+            self._stamps.pop(path, None)
+            for key in [k for k in self._search if k[0] == path]: del self._search[key]
+            for key in [k for k in self._indexes if k[0] == path]: del self._indexes[key]
+            for key in [k for k in self._expiry if k[0] == path]: del self._expiry[key]
+
+    def set_durability(self, mode, interval_ms=None):
+        self.writer.configure(mode, interval_ms)
+        if mode != "shutdown": self.flush()
+
+    def flush(self):
+        self.writer.flush()
+        for path in list(self._dirty): self._flush_path(path, True)
+
+    def shutdown(self):
+        print("DEBUG: Flushing pending writes before shutdown")
+        try:
+            self.flush()
+        except Exception as e:
+            print(f"DEBUG ERROR: Shutdown flush failed: {e}")
+
+    # --- CRUD Operations ---
+    def get_databases(self, user_obj=None):
+        try:
+            user_path = self.get_user_path(user_obj)
+            if not os.path.exists(user_path): return []
+            dbs = list(self._catalog(user_path))
+            print(f"DEBUG: Found databases: {dbs}")
+            return dbs
+        except Exception as e:
+            print(f"DEBUG ERROR: get_databases failed: {e}")
+            return []
+
+    def create_db(self, name, user_obj=None):
+        print(f"DEBUG: Creating DB {name}")
+        try:
+            path = self._db_path(name, user_obj)
+            with self._lock_for(path), self._process_lock(path):
+                if not os.path.exists(path):
+                    self._docs[path] = {"tables": {}}
+                    if STORAGE_COMPRESSION: self._docs[path]["compression"] = STORAGE_COMPRESSION
+                    self._dirty.add(path)
+                    try: self._flush_path(path, True)
+                    except Exception:
+                        # ফাইল তৈরি না হলে ক্যাশেও ডাটাবেস থাকা চলবে না, নাহলে পরের রাইটগুলো শূন্যে যায়
+                        self._evict(path)
+                        raise
+                    self._publish_db_event(path, "create_db")
+                    print("DEBUG: DB Created")
+                    return True
+            print("DEBUG: DB Exists")
+            return False
+        except Exception as e:
+            print(f"DEBUG ERROR: create_db failed: {e}")
+            return False
+
+    def set_compression(self, db, codec=None, user_obj=None):
+        # ফাইল কীভাবে জমা থাকবে: None/"none" = সাধারণ JSON, নইলে STORAGE_CODECS এর নাম
+        # ফাইল তখনই আবার লেখা হয়; পড়ার সময় ফরম্যাট ফাইল দেখেই বোঝা যায়, তাই আগে-পিছে বদলানো নিরাপদ
+        if codec in (None, "", "none"): codec = None
+        elif codec not in STORAGE_CODECS: return False, f"Unknown or unavailable codec: {codec} (have: {', '.join(STORAGE_CODECS)})"
+        try:
+            path = self._db_path(db, user_obj)
+            with self._write(path) as txn:
+                if codec: txn.doc["compression"] = codec
+                else: txn.doc.pop("compression", None)
+                txn.commit()
+            self._flush_path(path, True)
+            return True, f"Stored as {codec or 'plain JSON'} ({os.path.getsize(path)} bytes)"
+        except Exception as e:
+            print(f"DEBUG ERROR: set_compression failed: {e}")
+            return False, str(e)
+
+    def rename_db(self, old_name, new_name):
+        print(f"DEBUG: Renaming DB {old_name} to {new_name}")
+        try:
+            old_path = self._db_path(old_name)
+            new_path = self._db_path(new_name)
+            with self._lock_for(old_path), self._process_lock(old_path):
+                if os.path.exists(old_path) and not os.path.exists(new_path):
+                    self._flush_path(old_path, True)
+                    self._evict(old_path)
+                    os.rename(old_path, new_path)
+                    self._catalog_drop(old_path, new_path)
+                    self._publish_db_event(old_path, "drop_db")
+                    self._publish_db_event(new_path, "create_db")
+                    return True
+            return False
+        except Exception as e:
+            print(f"DEBUG ERROR: rename_db failed: {e}")
+            return False
+
+    def delete_db(self, name, user_obj=None):
+        print(f"DEBUG: Deleting DB {name}")
+        try:
+            path = self._db_path(name, user_obj)
+            with self._lock_for(path), self._process_lock(path):
+                self._evict(path)
+                if os.path.exists(path):
+                    os.remove(path)
+                    self._catalog_drop(path)
+                    self._publish_db_event(path, "drop_db")
+        except Exception as e:
+            print(f"DEBUG ERROR: delete_db failed: {e}")
+
+    def get_tables(self, db, user_obj=None):
+        try:
+            entry = self._catalog(self.get_user_path(user_obj)).get(db)
+            return list(entry["tables"]) if entry else []
+        except Exception as e:
+            print(f"DEBUG ERROR: get_tables failed: {e}")
+            return []
+
+    def create_table(self, db, table, cols, user_obj=None, types=None):
+        print(f"DEBUG: Creating table {table} in {db}")
+        try:
+            names, typed = parse_columns(cols, types)
+            with self._write(self._db_path(db, user_obj)) as txn:
+                d = txn.doc
+                if table not in d["tables"]:
+                    d["tables"][table] = {"columns": ["id"] + names, "rows": []}
+                    if typed: d["tables"][table]["types"] = typed
+                    txn.emit(table, "create")
+                    return True
+            return False
+        except Exception as e:
+            print(f"DEBUG ERROR: create_table failed: {e}")
+            return False
+
+    def _record_migration(self, table_data, op):
+        table_data["schema_version"] = table_data.get("schema_version", 0) + 1
+        op["v"] = table_data["schema_version"]
+        table_data.setdefault("migrations", []).append(op)
+
+    def _alter_columns(self, table_data, names, typed, renames, defaults=None):
+        # add/drop/rename মেটাডাটা হিসেবে জমা হয়, রো গুলো পরে upgrade_row দিয়ে ধরে
+        # সব কাজ ড্রাফটে হয়, তাই টাইপ বদল বাতিল হলে টেবিল আগের মতোই থাকে
+        draft = dict(table_data, migrations=list(table_data.get("migrations", [])))
+        old_cols = [c for c in draft["columns"] if c != "id"]
+        old_types = draft.get("types", {})
+        for old, new in renames.items():
+            if old in old_cols and new not in old_cols:
+                self._record_migration(draft, {"op": "rename", "from": old, "to": new})
+                old_cols[old_cols.index(old)] = new
+                if old in old_types and new not in typed: typed[new] = old_types[old]
+        for col in old_cols:
+            if col not in names: self._record_migration(draft, {"op": "drop", "col": col})
+        for col in names:
+            if col not in old_cols: self._record_migration(draft, {"op": "add", "col": col, "default": (defaults or {}).get(col)})
+        
+        # টাইপ বদলানো একমাত্র পরিবর্তন যেটা সব রো একবার পড়ে কনভার্ট করে; কোনোটা না মিললে পুরো পরিবর্তন বাতিল
+        changed = {c: t for c, t in typed.items() if c in old_cols and old_types.get(c) != t}
+        if changed:
+            # coerce_row "_" কী গুলো ফেলে দেয়; রো ভার্সন, স্কিমা ভার্সন আর মেয়াদ (_ver/_v/_exp) রেখে দিতে হবে
+            upgraded = [upgrade_row(draft, r) for r in draft["rows"]]
+            draft["rows"] = [dict(coerce_row({"types": changed}, r), **{k: v for k, v in r.items() if k.startswith("_")}) for r in upgraded]
+        if not draft["migrations"]: draft.pop("migrations")
+        draft["columns"] = ["id"] + names
+        if typed: draft["types"] = typed
+        else: draft.pop("types", None)
+        if draft.get("indexes"):
+            cols = [renames.get(c, c) for c in draft["indexes"]]
+            draft["indexes"] = [c for c in cols if c in draft["columns"]]
+        if draft.get("search_columns"):
+            # সার্চের কলামও নাম বদলের সাথে চলে; সবগুলো মুছে গেলে আবার সব টেক্সট কলাম
+            cols = [c for c in (renames.get(c, c) for c in draft["search_columns"]) if c in draft["columns"]]
+            if cols: draft["search_columns"] = cols
+            else: draft.pop("search_columns")
+        ttl_col = (draft.get("ttl") or {}).get("column")
+        if ttl_col:
+            # TTL এর কলামও নাম বদলের সাথে চলে; সেটা মুছতে হলে আগে TTL সরাতে হবে, নইলে রোগুলো ভুল মেয়াদ পায়
+            ttl_col = renames.get(ttl_col, ttl_col)
+            if ttl_col not in draft["columns"]: raise ValueError(f"Column {draft['ttl']['column']} is used by the TTL policy; remove the TTL first")
+            draft["ttl"] = dict(draft["ttl"], column=ttl_col)
+        # সব সফল হলে তবেই আসল টেবিলে বসানো হয়
+        table_data.clear()
+        table_data.update(draft)
+
+    def update_table_struct(self, db, old_table_name, new_table_name, new_cols, types=None, user_obj=None):
+        print(f"DEBUG: Updating table struct {old_table_name} -> {new_table_name}")
+        try:
+            specs, renames = split_renames(new_cols)
+            names, typed = parse_columns(specs, types)
+            with self._write(self._db_path(db, user_obj)) as txn:
+                d = txn.doc
+                if old_table_name not in d["tables"]: return False
+                if new_table_name != old_table_name and new_table_name in d["tables"]: return False
+                table_data = d["tables"][old_table_name]
+                version = table_data.get("schema_version", 0)
+                self._alter_columns(table_data, names, typed, renames)
+                d["tables"][new_table_name] = d["tables"].pop(old_table_name)
+                if new_table_name != old_table_name: txn.emit(old_table_name, "drop")
+                txn.emit(new_table_name, "schema")
+            if AUTO_BACKFILL and table_data.get("schema_version", 0) != version:
+                self.start_backfill(db, new_table_name, user_obj=user_obj)
+            return True
+        except Exception as e:
+            print(f"DEBUG ERROR: update_table_struct failed: {e}")
+            return False
+
+    def add_column(self, db, table, col, typ=None, default=None, user_obj=None):
+        try:
+            with self._write(self._db_path(db, user_obj)) as txn:
+                t = txn.doc["tables"][table]
+                cols = [c for c in t["columns"] if c != "id"]
+                names, typed = parse_columns(cols + [f"{col}:{typ}" if typ else col], t.get("types"))
+                if typ: default = coerce_row({"types": {col: typ}}, {col: default})[col]
+                self._alter_columns(t, names, typed, {}, defaults={col: default})
+                txn.emit(table, "schema")
+            return True, "Column added"
+        except Exception as e:
+            print(f"DEBUG ERROR: add_column failed: {e}")
+            return False, str(e)
+
+    def drop_column(self, db, table, col, user_obj=None):
+        try:
+            with self._write(self._db_path(db, user_obj)) as txn:
+                t = txn.doc["tables"][table]
+                if col not in t["columns"] or col == "id": return False, "Column not found"
+                names = [c for c in t["columns"] if c not in ("id", col)]
+                typed = {c: v for c, v in t.get("types", {}).items() if c != col}
+                self._alter_columns(t, names, typed, {})
+                txn.emit(table, "schema")
+            return True, "Column dropped"
+        except Exception as e:
+            print(f"DEBUG ERROR: drop_column failed: {e}")
+            return False, str(e)
+
+    def rename_column(self, db, table, old, new, user_obj=None):
+        try:
+            with self._write(self._db_path(db, user_obj)) as txn:
+                t = txn.doc["tables"][table]
+                if old not in t["columns"] or old == "id": return False, "Column not found"
+                if new in t["columns"]: return False, "Column already exists"
+                names, typed = parse_columns([new if c == old else c for c in t["columns"]], {k: v for k, v in t.get("types", {}).items() if k != old})
+                self._alter_columns(t, names, typed, {old: new})
+                txn.emit(table, "schema")
+            return True, "Column renamed"
+        except Exception as e:
+            print(f"DEBUG ERROR: rename_column failed: {e}")
+            return False, str(e)
+
+    def start_backfill(self, db, table, user_obj=None, batch=BACKFILL_BATCH):
+        # পুরনো স্কিমার রো ছোট ব্যাচে নতুন স্কিমায় লেখে, শেষে মাইগ্রেশন লগ ছাঁটে
+        path = self._db_path(db, user_obj)
+        def run():
+            print(f"DEBUG: Backfill started for {db}.{table}")
+            try:
+                while True:
+                    with self._write(path) as txn:
+                        t = txn.doc["tables"].get(table)
+                        if t is None: return
+                        target = t.get("schema_version", 0)
+                        rows, done = t["rows"], 0
+                        for i, r in enumerate(rows):
+                            if r.get("_v", 0) < target:
+                                txn.replace(self._own_rows(t), i, upgrade_row(t, r))
+                                done += 1
+                                if done >= batch: break
+                        if done == 0:
+                            # সব রো বর্তমান ভার্সনে — পুরনো মাইগ্রেশন রেকর্ড আর দরকার নেই
+                            if t.get("migrations"):
+                                t["migrations"] = [m for m in t["migrations"] if m["v"] > target]
+                                txn.commit()
+                            print(f"DEBUG: Backfill finished for {db}.{table}")
+                            return
+                        txn.commit()
+                    time.sleep(0.01)
+            except Exception as e:
+                print(f"DEBUG ERROR: Backfill failed for {db}.{table}: {e}")
+        th = threading.Thread(target=run, daemon=True)
+        th.start()
+        return th
+
+    def delete_table(self, db, table, user_obj=None):
+        print(f"DEBUG: Deleting table {table}")
+        try:
+            with self._write(self._db_path(db, user_obj)) as txn:
+                d = txn.doc
+                if table in d["tables"]:
+                    del d["tables"][table]
+                    txn.emit(table, "drop")
+        except Exception as e:
+            print(f"DEBUG ERROR: delete_table failed: {e}")
+
+    def get_table_data(self, db, table, user_obj=None):
+        try:
+            with self._snapshot(self._db_path(db, user_obj)) as d:
+                data = d["tables"].get(table)
+                if data: return list(data["columns"]), list(self._rows(data))
+        except Exception as e:
+            print(f"DEBUG ERROR: get_table_data failed: {e}")
+        return [], []
+
+    def _rows(self, table_data):
+        # পাঠকরা যেভাবে রো দেখবে (মেয়াদোত্তীর্ণ রো বাদ)
+        now = time.time() if table_data.get("ttl") else None
+        for r in table_data["rows"]:
+            if now is not None and is_expired(r, now): continue
+            yield upgrade_row(table_data, r)
+
+    def read_table(self, db, table, since_version=None, user_obj=None):
+        # টেবিল আর তার ভার্সন; since_version দিলে শুধু তার পরের রো আর মোছা id
+        # ডেল্টা বের করা না গেলে (স্কিমা বদল বা টুম্বস্টোন ছাঁটা) full=True সহ সব রো
+        try:
+            with self._snapshot(self._db_path(db, user_obj)) as d:
+                t = d["tables"].get(table)
+                if t is None: return None
+                version = t.get("version", 0)
+                full = since_version is None or since_version < t.get("sync_floor", 0) or since_version > version
+                res = {"columns": list(t["columns"]), "version": version, "full": full, "deleted": []}
+                if full:
+                    res["rows"] = list(self._rows(t))
+                else:
+                    res["rows"] = [r for r in self._rows(t) if r.get("_ver", 0) > since_version]
+                    res["deleted"] = [x["id"] for x in t.get("tombstones", []) if x["_ver"] > since_version]
+                return res
+        except FileNotFoundError:
+            # ডাটাবেস নেই: টেবিল না থাকার মতোই খালি উত্তর (সার্ভারের পাথ ক্লায়েন্টকে দেখানো হয় না)
+            return None
+
+    def get_table_version(self, db, table, user_obj=None):
+        try:
+            with self._read(self._db_path(db, user_obj)) as d:
+                t = d["tables"].get(table)
+                return None if t is None else t.get("version", 0)
+        except Exception as e:
+            print(f"DEBUG ERROR: get_table_version failed: {e}")
+            return None
+
+    def get_table_types(self, db, table, user_obj=None):
+        try:
+            with self._read(self._db_path(db, user_obj)) as d: return dict(d["tables"][table].get("types", {}))
+        except Exception as e:
+            print(f"DEBUG ERROR: get_table_types failed: {e}")
+            return {}
+
+    def insert_data(self, db, table, data, user_obj=None):
+        print(f"DEBUG: Inserting data into {table}")
+        try:
+            with self._write(self._db_path(db, user_obj)) as txn:
+                t = txn.doc["tables"][table]
+                row = stamp_expiry(t, coerce_row(t, data))
+                if t.get("schema_version"): row["_v"] = t["schema_version"]
+                new_id = str(max([int(r.get("id", 0)) for r in t["rows"]], default=0) + 1)
+                row["id"] = new_id
+                self._own_rows(t).append(row)
+                txn.emit(table, "insert", new_id, row)
+            return True, new_id
+        except Exception as e:
+            print(f"DEBUG ERROR: insert_data failed: {e}")
+            return False, str(e)
+
+    def insert_many(self, db, table, records, user_obj=None, skip_invalid=False):
+        # এক কমিটে অনেক রো, ফেরত (True, ids, errors)
+        # খারাপ রো পুরো ব্যাচ বাতিল করে; skip_invalid হলে সেটা errors এ (অবস্থান, কারণ) হিসেবে যায়, বাকিরা ঢোকে
+        try:
+            with self._write(self._db_path(db, user_obj)) as txn:
+                t = txn.doc["tables"][table]
+                good, errors = [], []
+                for n, rec in enumerate(records):
+                    try: good.append(stamp_expiry(t, coerce_row(t, rec)))
+                    except (ValueError, AttributeError) as e:
+                        if not skip_invalid: return False, f"Row {n}: {e}", []
+                        errors.append((n, str(e)))
+                ids, rows = [], self._own_rows(t)
+                # আইডি একবারই হিসাব করে বাড়ানো হয়, প্রতি রো-তে পুরো টেবিল স্ক্যান না করে
+                next_n = max([int(r.get("id", 0)) for r in rows], default=0) + 1
+                for row in good:
+                    if t.get("schema_version"): row["_v"] = t["schema_version"]
+                    row["id"] = str(next_n)
+                    next_n += 1
+                    rows.append(row)
+                    ids.append(row["id"])
+                    txn.emit(table, "insert", row["id"], row)
+            print(f"DEBUG: Inserted {len(ids)} rows into {table}")
+            return True, ids, errors
+        except Exception as e:
+            print(f"DEBUG ERROR: insert_many failed: {e}")
+            return False, str(e), []
+
+    def iter_import(self, db, table, records, chunk_size=IMPORT_CHUNK, create=False, guard=None, user_obj=None):
+        # রেকর্ড স্ট্রিম করে প্রতি চাঙ্কে এক কমিট, প্রতি চাঙ্কের পর চলতি সারাংশ yield
+        # guard() প্রতি চাঙ্কের রাইটের জন্য একটা কনটেক্সট ম্যানেজার দিতে পারে
+        summary = {"inserted": 0, "failed": 0, "chunks": 0, "errors": []}
+        base, checked = 0, not create
+        records = iter(records)
+        while True:
+            # প্রতিটি কমিট পুরো ফাইল লেখে, তাই টেবিল বড় হলে চাঙ্কও বড় হয় — মোট লেখার খরচ প্রায় রৈখিক থাকে
+            size = min(max(chunk_size, summary["inserted"] // 2), max(chunk_size, IMPORT_CHUNK_MAX))
+            batch = [rec for _, rec in zip(range(size), records)]
+            if not batch: break
+            # পার্স না হওয়া রেকর্ড (RecordError) বাদ যায়; বাকি রো গুলোর আসল ক্রমিক নম্বর রাখা হয় রিপোর্টের জন্য
+            bad = [str(rec) for rec in batch if isinstance(rec, RecordError)]
+            numbers = [base + i + 1 for i, rec in enumerate(batch) if not isinstance(rec, RecordError)]
+            chunk = [rec for rec in batch if not isinstance(rec, RecordError)]
+            if not checked and chunk:
+                checked = True
+                if table not in self.get_tables(db, user_obj):
+                    cols = [k for k in chunk[0] if k != "id" and not str(k).startswith("_")]
+                    self.create_table(db, table, cols, user_obj=user_obj)
+            ids, errors = [], []
+            if chunk and guard:
+                with guard(): ok, ids, errors = self.insert_many(db, table, chunk, user_obj=user_obj, skip_invalid=True)
+            elif chunk:
+                ok, ids, errors = self.insert_many(db, table, chunk, user_obj=user_obj, skip_invalid=True)
+            if chunk and not ok: raise ValueError(ids)
+            summary["inserted"] += len(ids)
+            summary["failed"] += len(errors) + len(bad)
+            summary["chunks"] += 1
+            reports = bad + [f"Row {numbers[n]}: {msg}" for n, msg in errors]
+            summary["errors"].extend(reports[:10 - len(summary["errors"])])
+            base += len(batch)
+            yield summary
+        print(f"DEBUG: Import into {table} done: {summary['inserted']} rows, {summary['failed']} failed")
+        if summary["chunks"] == 0: yield summary
+
+    def import_rows(self, db, table, records, chunk_size=IMPORT_CHUNK, create=False, progress=None, user_obj=None):
+        summary = None
+        for summary in self.iter_import(db, table, records, chunk_size, create, user_obj=user_obj):
+            if progress: progress(summary)
+        return summary
+
+    def export_rows(self, db, table, fmt="ndjson", user_obj=None, batch=1000):
+        # টেবিলকে CSV বা NDJSON টেক্সট চাঙ্কে yield করে
+        fmt = detect_format(fmt)
+        # পুরো স্ট্রিম জুড়ে স্ন্যাপশট ধরে রাখা হয়; রাইটাররা এর মধ্যে নতুন ভার্সন বানায়
+        with self._snapshot(self._db_path(db, user_obj)) as d:
+            t = d["tables"][table]
+            cols = t["columns"]
+            buf = io.StringIO()
+            writer = csv.writer(buf) if fmt == "csv" else None
+            if writer: writer.writerow(cols)
+            for n, r in enumerate(self._rows(t), 1):
+                if writer: writer.writerow(["" if r.get(c) is None else r.get(c) for c in cols])
+                else: buf.write(json.dumps({c: r.get(c) for c in cols}, ensure_ascii=False) + "\n")
+                if n % batch == 0:
+                    yield buf.getvalue()
+                    buf.seek(0); buf.truncate()
+            if buf.getvalue(): yield buf.getvalue()
+
+    def update_row_data(self, db, table, row_id, new_data, user_obj=None):
+        print(f"DEBUG: Updating row {row_id} in {table}")
+        try:
+            with self._write(self._db_path(db, user_obj)) as txn:
+                t = txn.doc["tables"][table]
+                now = time.time()
+                for i, row in enumerate(t["rows"]):
+                    # মেয়াদোত্তীর্ণ রো (সুইপার এখনো না মুছলেও) পড়ায় দেখা যায় না, তাই আপডেটেও নেই — নইলে নতুন _exp পেয়ে ফিরে আসত
+                    if str(row.get("id")) == str(row_id) and not is_expired(row, now):
+                        new_row = stamp_expiry(t, coerce_row(t, new_data))
+                        if t.get("schema_version"): new_row["_v"] = t["schema_version"]
+                        new_row["id"] = row_id
+                        txn.replace(self._own_rows(t), i, new_row)
+                        txn.emit(table, "update", row_id, new_row)
+                        return True, "Updated"
+            return False, "ID not found"
+        except Exception as e:
+            print(f"DEBUG ERROR: update_row_data failed: {e}")
+            return False, str(e)
+
+    def field_op(self, db, table, row_id, column, op, value=None, expected=_UNSET, expected_version=None, user_obj=None):
+        # রাইট লকের ভেতরে এক ফিল্ডে অ্যাটমিক incr/decr (value, ডিফল্ট 1), append বা cas
+        # cas এ expected আর/বা expected_version লাগে; ফেরত (ok, msg, row), conflict এ row হলো বর্তমান রো যাতে আবার চেষ্টা করা যায়
+        if op not in FIELD_OPS: return False, f"Unknown field op: {op}", None
+        if op == "cas" and expected is _UNSET and expected_version is None: return False, "cas needs expected or expected_version", None
+        try:
+            with self._write(self._db_path(db, user_obj)) as txn:
+                t = txn.doc["tables"][table]
+                if column == "id" or column not in t["columns"]: return False, "Column not found", None
+                typ, now = (t.get("types") or {}).get(column), time.time()
+                for i, row in enumerate(t["rows"]):
+                    if str(row.get("id")) != str(row_id) or is_expired(row, now): continue
+                    cur = upgrade_row(t, row)
+                    if expected_version is not None and cur.get("_ver", 0) != int(expected_version): return False, "Conflict", cur
+                    if expected is not _UNSET and not same_value(cur.get(column), expected, typ): return False, "Conflict", cur
+                    # রো ডিক্ট জায়গায় বদলানো হয় না (স্ন্যাপশট পাঠকরা পুরনোটাই দেখে), শুধু এই ফিল্ড নতুন
+                    new_row = {k: v for k, v in cur.items() if not k.startswith("_")}
+                    try: new_row[column] = apply_field_op(op, cur.get(column), value, typ)
+                    except ValueError as e: raise ValueError(f"Column '{column}' {e}") from None
+                    stamp_expiry(t, new_row)
+                    if t.get("schema_version"): new_row["_v"] = t["schema_version"]
+                    txn.replace(self._own_rows(t), i, new_row)
+                    txn.emit(table, "update", new_row["id"], new_row)
+                    return True, "Updated", new_row
+            return False, "ID not found", None
+        except Exception as e:
+            print(f"DEBUG ERROR: field_op failed: {e}")
+            return False, str(e), None
+
+    def delete_data(self, db, table, row_id, user_obj=None):
+        print(f"DEBUG: Deleting row {row_id} from {table}")
+        try:
+            with self._write(self._db_path(db, user_obj)) as txn:
+                t = txn.doc["tables"][table]
+                kept = [r for r in t["rows"] if str(r.get("id")) != str(row_id)]
+                if len(kept) != len(t["rows"]):
+                    t["rows"] = kept
+                    txn.emit(table, "delete", row_id)
+        except Exception as e:
+            print(f"DEBUG ERROR: delete_data failed: {e}")
+
+    def aggregate(self, db, table, aggs, where=None, group_by=None, user_obj=None):
+        # এক পাসে count/sum/avg/min/max; কলাম = group_by কলামগুলো, তারপর প্রতি অ্যাগ্রিগেটে একটা
+        specs = _parse_aggs(aggs)
+        keys = [group_by] if isinstance(group_by, str) else list(group_by or [])
+        groups = {}
+        try:
+            with self._snapshot(self._db_path(db, user_obj)) as d:
+                t = d["tables"].get(table)
+                if t is None: raise ValueError("Table not found")
+                for r in self._rows(t):
+                    if not row_matches(r, where): continue
+                    gk = tuple(r.get(k, "") for k in keys)
+                    acc = groups.get(gk)
+                    if acc is None: acc = groups[gk] = [[0, 0, 0, None] for _ in specs]
+                    for (_, fn, col), slot in zip(specs, acc):
+                        if col is None:
+                            slot[0] += 1
+                            continue
+                        v = r.get(col)
+                        if v is None or v == "": continue
+                        slot[0] += 1
+                        if fn in ("sum", "avg"):
+                            n = _to_number(v)
+                            if n is None: continue
+                            slot[1] += n; slot[2] += 1
+                        elif fn in ("min", "max"):
+                            if slot[3] is None or (_compare_key(v) < _compare_key(slot[3])) == (fn == "min"): slot[3] = v
+        except FileNotFoundError:
+            # ডাটাবেস নেই: টেবিল না থাকার মতোই উত্তর (সার্ভারের পাথ ক্লায়েন্টকে দেখানো হয় না)
+            raise ValueError("Table not found") from None
+        if not groups and not keys: groups[()] = [[0, 0, 0, None] for _ in specs]
+        
+        out = []
+        for gk, acc in groups.items():
+            vals = []
+            for (_, fn, _), (cnt, total, num, best) in zip(specs, acc):
+                if fn == "count": vals.append(cnt)
+                elif fn == "sum": vals.append(total)
+                elif fn == "avg": vals.append(total / num if num else None)
+                else: vals.append(best)
+            out.append(list(gk) + vals)
+        return keys + [name for name, _, _ in specs], out
+
+    # --- Full-text Search ---
+    def _search_columns(self, t):
+        if t.get("search_columns"): return [c for c in t["search_columns"] if c in t["columns"]]
+        types = t.get("types", {})
+        return [c for c in t["columns"] if c != "id" and types.get(c, "text") == "text"]
+
+    def set_search_columns(self, db, table, cols, user_obj=None):
+        # সার্চ ইনডেক্স কোন কলাম ধরবে (খালি = সব টেক্সট কলাম)
+        try:
+            path = self._db_path(db, user_obj)
+            with self._write(path) as txn:
+                t = txn.doc["tables"][table]
+                cols = [c for c in cols if c in t["columns"] and c != "id"]
+                if cols: t["search_columns"] = cols
+                else: t.pop("search_columns", None)
+                self._search.pop((path, table), None)
+                txn.commit()
+            return True
+        except Exception as e:
+            print(f"DEBUG ERROR: set_search_columns failed: {e}")
+            return False
+
+    def _search_index(self, path, table, t):
+        # পাথ লক ধরে কল করা হয়; প্রথম ব্যবহারে বানানো, তারপর কমিট ইভেন্ট থেকে হালনাগাদ
+        idx = self._search.get((path, table))
+        if idx is None:
+            idx = SearchIndex(self._search_columns(t))
+            for r in self._rows(t): idx.add(str(r.get("id")), r)
+            self._search[(path, table)] = idx
+            print(f"DEBUG: Built search index for {table} ({len(idx.lengths)} rows, {len(idx.postings)} terms)")
+        return idx
+
+    def search(self, db, table, query, limit=20, user_obj=None):
+        # সেরা আগে [(row_id, score)]; ইনডেক্স প্রথম ব্যবহারে বানানো, তারপর হালনাগাদ
+        path = self._db_path(db, user_obj)
+        with self._read(path) as d:
+            return self._search_index(path, table, d["tables"][table]).search(query, limit)
+
+    def search_rows(self, db, table, query, limit=20, user_obj=None):
+        # search এর মতোই, তবে ইনডেক্স থেকে রো সহ (columns, [(row, score)])
+        path = self._db_path(db, user_obj)
+        with self._read(path) as d:
+            t = d["tables"][table]
+            idx = self._search_index(path, table, t)
+            return list(t["columns"]), [(idx.rows[rid], score) for rid, score in idx.search(query, limit)]
+
+    # --- Row TTL ---
+    def set_ttl(self, db, table, seconds=None, column=None, user_obj=None):
+        # রো seconds পর মেয়াদোত্তীর্ণ: শেষ লেখা থেকে, বা column দিলে সেই কলামের সময় থেকে
+        # সব রো এর মেয়াদ নতুন করে বসে; আর্গুমেন্ট ছাড়া ডাকলে TTL সরে যায়
+        try:
+            if seconds is not None and float(seconds) < 0: return False, "TTL must not be negative"
+            path = self._db_path(db, user_obj)
+            with self._write(path) as txn:
+                t = txn.doc["tables"][table]
+                if column and column not in t["columns"]: return False, "Column not found"
+                if seconds is None and not column: t.pop("ttl", None)
+                else:
+                    t["ttl"] = {"seconds": float(seconds or 0)}
+                    if column: t["ttl"]["column"] = column
+                # রো ডিক্ট জায়গায় বদলানো হয় না (স্ন্যাপশট পাঠকরা পুরনোটাই দেখে), তাই নতুন কপি
+                now, rows = time.time(), []
+                for r in t["rows"]:
+                    r = {k: v for k, v in r.items() if k != "_exp"}
+                    try: exp = row_expiry(t, upgrade_row(t, r), now)
+                    except ValueError: exp = None
+                    if exp is not None: r["_exp"] = exp
+                    rows.append(r)
+                t["rows"] = rows
+                txn.emit(table, "ttl")
+                if t.get("ttl"): self._track_ttl(path, table)
+            return True, "TTL updated" if seconds is not None or column else "TTL removed"
+        except Exception as e:
+            print(f"DEBUG ERROR: set_ttl failed: {e}")
+            return False, str(e)
+
+    def _track_ttl(self, path, table):
+        self._ttl_tables.add((path, table))
+        if self.expire_rows and self._sweeper is None:
+            self._sweeper = threading.Thread(target=self._sweep_loop, daemon=True)
+            self._sweeper.start()
+
+    def _sweep_loop(self):
+        while True:
+            time.sleep(TTL_SWEEP_INTERVAL)
+            if not self.expire_rows: continue
+            for path, table in list(self._ttl_tables):
+                try: self.sweep_expired(path, table)
+                except Exception as e:
+                    print(f"DEBUG ERROR: TTL sweep failed for {table}: {e}")
+                    self._ttl_tables.discard((path, table))
+
+    def sweep_expired(self, path, table):
+        # এক পাসে, এক কমিটে সব মেয়াদোত্তীর্ণ রো মোছে; কতগুলো মুছল ফেরত দেয়
+        with self._write(path) as txn:
+            t = txn.doc["tables"].get(table)
+            if t is None or not t.get("ttl"):
+                self._ttl_tables.discard((path, table))
+                return 0
+            heap = self._expiry.get((path, table))
+            if heap is None:
+                heap = self._expiry[(path, table)] = [(r["_exp"], str(r.get("id"))) for r in t["rows"] if r.get("_exp") is not None]
+                heapq.heapify(heap)
+            # মেয়াদ অনুযায়ী সাজানো, তাই কিছু না মিটলে প্রথম এন্ট্রি দেখেই ফেরত — পুরো টেবিল স্ক্যান হয় না
+            now, due = time.time(), set()
+            while heap and heap[0][0] <= now: due.add(heapq.heappop(heap)[1])
+            if not due: return 0
+            # প্রতি সুইপে রো লিস্ট একবারই নতুন করে বানানো আর একবারই কমিট — টুকরো ব্যাচে ভাগ করলে
+            # প্রতিটা ব্যাচ আবার পুরো টেবিল স্ক্যান আর পুরো ফাইল রিরাইট করে
+            kept, removed = [], 0
+            for r in t["rows"]:
+                if str(r.get("id")) in due and is_expired(r, now):
+                    txn.emit(table, "delete", r.get("id"))
+                    removed += 1
+                else: kept.append(r)
+            t["rows"] = kept
+        return removed
+
+    # --- Indexes & Join ---
+    def create_index(self, db, table, col, user_obj=None):
+        # col এ হ্যাশ ইনডেক্স ঘোষণা; প্রথম ব্যবহারে বানানো, তারপর রাইট থেকে হালনাগাদ
+        try:
+            with self._write(self._db_path(db, user_obj)) as txn:
+                t = txn.doc["tables"][table]
+                if col not in t["columns"]: return False, "Column not found"
+                if col in t.get("indexes", []): return False, "Index already exists"
+                t.setdefault("indexes", []).append(col)
+                txn.emit(table, "index")
+            return True, "Index created"
+        except Exception as e:
+            print(f"DEBUG ERROR: create_index failed: {e}")
+            return False, str(e)
+
+    def drop_index(self, db, table, col, user_obj=None):
+        try:
+            with self._write(self._db_path(db, user_obj)) as txn:
+                t = txn.doc["tables"][table]
+                if col not in t.get("indexes", []): return False, "Index not found"
+                t["indexes"].remove(col)
+                if not t["indexes"]: del t["indexes"]
+                txn.emit(table, "index")
+            return True, "Index dropped"
+        except Exception as e:
+            print(f"DEBUG ERROR: drop_index failed: {e}")
+            return False, str(e)
+
+    def _hash_index(self, path, table, t, col):
+        # পাথ লক ধরে রাখা অবস্থায় কল করা হয়
+        if col not in t.get("indexes", []) or col not in t["columns"]: return None
+        idxs = self._indexes.setdefault((path, table), {})
+        idx = idxs.get(col)
+        if idx is None:
+            idx = idxs[col] = HashIndex(col)
+            for r in self._rows(t): idx.add(str(r.get("id")), r)
+            print(f"DEBUG: Built index {table}.{col} ({len(idx.buckets)} keys)")
+        return idx
+
+    def join(self, db, left, right, on, columns=None, where=None, how="inner", limit=None, user_obj=None):
+        # একই ডাটাবেসের দুই টেবিলের হ্যাশ জয়েন, ফেরত (columns, rows); কলামের নাম "table.col"
+        # on = দুই টেবিলের একই কলাম বা {left_col: right_col}; where এ aggregate এর সিনট্যাক্স, how = "inner" বা "left"
+        if how not in ("inner", "left"): raise ValueError(f"Unknown join type: {how}")
+        if left == right: raise ValueError("Self-joins are not supported")
+        pairs = list(on.items()) if isinstance(on, dict) else [(on, on)]
+        if not pairs: raise ValueError("Join columns are required")
+        path = self._db_path(db, user_obj)
+        with self._read(path) as d:
+            lt, rt = d["tables"].get(left), d["tables"].get(right)
+            if lt and rt and len(pairs) == 1 and (pairs[0][1] in rt.get("indexes", []) or (how == "inner" and pairs[0][0] in lt.get("indexes", []))):
+                # হ্যাশ ইনডেক্স কমিটের সাথে লকের ভেতরে বদলায়, তাই ইনডেক্স দিয়ে খোঁজা লক ধরেই হয়
+                return self._join(path, d, left, right, pairs, columns, where, how, limit, True)
+        # ইনডেক্স না থাকলে পুরো টেবিল হ্যাশ করতে হয়; সেই লম্বা স্ক্যান পিন করা স্ন্যাপশটে, যাতে রাইটাররা আটকে না থাকে
+        with self._snapshot(path) as d:
+            return self._join(path, d, left, right, pairs, columns, where, how, limit, False)
+
+    def _join(self, path, d, left, right, pairs, columns, where, how, limit, indexed):
+        lt, rt = d["tables"].get(left), d["tables"].get(right)
+        if lt is None or rt is None: raise ValueError(f"Table not found: {left if lt is None else right}")
+        for lc, rc in pairs:
+            if lc not in lt["columns"]: raise ValueError(f"Column not found: {left}.{lc}")
+            if rc not in rt["columns"]: raise ValueError(f"Column not found: {right}.{rc}")
+        
+        # প্রজেকশন ও ফিল্টার দুটোই "table.col" নামে; কোন পাশের কলাম সেটা আগেই ঠিক করে রাখা হয়
+        sides = {left: lt["columns"], right: rt["columns"]}
+        def resolve(name):
+            tbl, dot, col = str(name).rpartition(".")
+            if dot and tbl in sides and col in sides[tbl]: return tbl, col
+            owners = [tb for tb, cols in sides.items() if name in cols]
+            if len(owners) != 1: raise ValueError(f"{'Ambiguous' if owners else 'Unknown'} column: {name}")
+            return owners[0], name
+        picks = [resolve(c) for c in columns] if columns else [(tb, c) for tb, cols in sides.items() for c in cols]
+        filters = {left: {}, right: {}}
+        for name, cond in (where or {}).items():
+            tb, col = resolve(name)
+            filters[tb][col] = cond
+        
+        lkeys, rkeys = [lc for lc, _ in pairs], [rc for _, rc in pairs]
+        def key(row, cols):
+            k = tuple(HashIndex.key(row.get(c)) for c in cols)
+            return None if None in k else k
+        def scan(tb, t): return (r for r in self._rows(t) if row_matches(r, filters[tb]))
+        
+        ridx = self._hash_index(path, right, rt, rkeys[0]) if indexed else None
+        lidx = self._hash_index(path, left, lt, lkeys[0]) if indexed and how == "inner" else None
+        if ridx or lidx:
+            # ইনডেক্স থাকলে সেই টেবিল হ্যাশ করতে হয় না, অন্য পাশ থেকে সরাসরি খোঁজা হয়
+            swap = ridx is None
+            idx, probe_tb, probe_t, probe_col = (lidx, right, rt, rkeys[0]) if swap else (ridx, left, lt, lkeys[0])
+            other = left if swap else right
+            now = time.time()
+            lookup = lambda r: [m for m in idx.get(r.get(probe_col)) if not is_expired(m, now) and row_matches(m, filters[other])]
+        else:
+            # ইনডেক্স না থাকলে ছোট টেবিলটা হ্যাশ করা হয় (left join এ সবসময় ডান পাশ)
+            swap = how == "inner" and len(lt["rows"]) < len(rt["rows"])
+            build_tb, build_t, build_cols = (left, lt, lkeys) if swap else (right, rt, rkeys)
+            probe_tb, probe_t, probe_cols = (right, rt, rkeys) if swap else (left, lt, lkeys)
+            table = {}
+            for r in scan(build_tb, build_t):
+                k = key(r, build_cols)
+                if k is not None: table.setdefault(k, []).append(r)
+            lookup = lambda r: table.get(key(r, probe_cols), ())
+        
+        out = []
+        for pr in scan(probe_tb, probe_t):
+            matches = lookup(pr)
+            if not matches and how == "left": matches = [{}]
+            for m in matches:
+                rows = {left: m, right: pr} if swap else {left: pr, right: m}
+                out.append([rows[tb].get(c) for tb, c in picks])
+                if limit and len(out) >= limit: break
+            if limit and len(out) >= limit: break
+        return [f"{tb}.{c}" for tb, c in picks], out
+
+    # --- Replication ---
+    def snapshot_db(self, db, user_obj=None):
+        # ডাটাবেসের JSON আর তার সাথে মেলানো feed_seq
+        # group মোডে কমিট ফ্লাশের পরে পাবলিশ হয়, তাই seq স্ন্যাপশটের একটু পেছনে থাকতে পারে; রেপ্লিকা পুরনো ভার্সনের ইভেন্ট বাদ দেয়
+        view, seq = self._freeze(self._db_path(db, user_obj))
+        try: return json.dumps(view, separators=(",", ":")), seq
+        finally: self._release(view)
+
+    def install_snapshot(self, db, doc, user_obj=None):
+        # প্রাইমারি থেকে আসা কপি দিয়ে লোকাল ডাটাবেস বদলায়
+        path = self._db_path(db, user_obj)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with self._lock_for(path):
+            self._evict(path)
+            self._docs[path] = doc
+        # রেপ্লিকার নিজের ক্লায়েন্টদের জানানো: টেবিল গুলো পুরো নতুন করে নিতে হবে
+        # (কমিটের অপেক্ষা পাথ লকের বাইরে হতে হবে, নাহলে ফ্লাশার আটকে যায়)
+        with self._write(path) as txn:
+            for table, t in doc["tables"].items(): txn.emit(table, "schema", version=t.get("version", 0))
+            txn.commit()
+
+    def apply_replication(self, db, table, events, user_obj=None):
+        # প্রাইমারির রো ইভেন্ট ক্রমানুসারে চালায়; টেবিল আবার স্ন্যাপশট করতে হলে False
+        path = self._db_path(db, user_obj)
+        if not os.path.exists(path) and path not in self._docs: return False
+        with self._write(path) as txn:
+            t = txn.doc["tables"].get(table)
+            if t is None: return False
+            rows = self._own_rows(t)
+            pos = {str(r.get("id")): i for i, r in enumerate(rows)}
+            removed = False
+            for ev in events:
+                # আগে থেকে প্রয়োগ করা (বা স্ন্যাপশটে থাকা) ইভেন্ট বাদ — তাই রিপ্লে নিরাপদ
+                if ev.get("version", 0) <= t.get("version", 0): continue
+                rid = ev.get("id")
+                if ev["op"] in ("insert", "update"):
+                    row = dict(ev["row"])
+                    if t.get("schema_version"): row["_v"] = t["schema_version"]
+                    if rid in pos and rows[pos[rid]] is not None: txn.replace(rows, pos[rid], row)
+                    else:
+                        pos[rid] = len(rows)
+                        rows.append(row)
+                    txn.emit(table, ev["op"], rid, row, version=ev["version"])
+                elif ev["op"] == "delete":
+                    if rid in pos and rows[pos[rid]] is not None:
+                        txn.replace(rows, pos.pop(rid), None)
+                        removed = True
+                    txn.emit(table, "delete", rid, version=ev["version"])
+            if removed: t["rows"] = [r for r in rows if r is not None]
+        return True
+
+    def ensure_user(self, user, password, uid):
+        # এই uid এর ইউজার লোকালি আছে কি না নিশ্চিত করে (রেপ্লিকার জন্য)
+        with open(self.auth_file, 'r') as f: users = json.load(f)
+        users = [u for u in users if u['user'] != user]
+        users.append({"user": user, "pass": password, "uid": uid})
+        with open(self.auth_file, 'w') as f: json.dump(users, f)
+        os.makedirs(os.path.join(self.root, uid), exist_ok=True)
+
+    # --- Backup System ---
+    def create_backup(self, db_name=None):
+        print(f"DEBUG: Creating backup for {db_name}")
+        try:
+            ts = datetime.now().strftime("%Y%m%d_%H%M%S")
+            user_path = self.get_user_path()
+            
+            if db_name and db_name != "ALL":
+                source_file = os.path.join(user_path, f"{db_name}.json")
+                if not os.path.exists(source_file): return "Database not found!"
+                
+                zip_filename = f"{CURRENT_USER['user']}_{db_name}_{ts}.zip"
+                save_path = os.path.join(self.backup_dir, zip_filename)
+                
+                with zipfile.ZipFile(save_path, 'w', zipfile.ZIP_DEFLATED) as zf:
+                    self._backup_db(zf, source_file, f"{db_name}.json")
+                return f"Backup Saved!\nLocation:\n{save_path}"
+            else:
+                base_name = f"{CURRENT_USER['user']}_FULL_{ts}.zip"
+                save_path = os.path.join(self.backup_dir, base_name)
+                
+                with zipfile.ZipFile(save_path, 'w', zipfile.ZIP_DEFLATED) as zf:
+                    for root, dirs, files in os.walk(user_path):
+                        for file in files:
+                            file_path = os.path.join(root, file)
+                            # ক্যাটালগ (.catalog.json) রিস্টোরের পর নিজেই আবার তৈরি হয়
+                            if file.startswith(".") or file.endswith(".tmp"): continue
+                            if file.endswith(".json"): self._backup_db(zf, file_path, file)
+                            else: zf.write(file_path, arcname=file)
+                return f"Full Backup Saved!\nLocation:\n{save_path}"
+        except Exception as e:
+            print(f"DEBUG ERROR: create_backup failed: {e}")
+            return f"Error: {str(e)}"
+
+    def _backup_db(self, zf, path, arcname):
+        # কম্প্রেসড ডাটাবেস ফাইল যেমন আছে তেমনই zip এ যায় (খুলে আবার কম্প্রেস করা হয় না);
+        # ফ্লাশের পর ডিস্ক আর মেমরি এক, আর পাথ লক থাকায় পড়ার মাঝে ফাইল বদলায় না
+        self._flush_path(path)
+        with self._lock_for(path):
+            with open(path, 'rb') as f:
+                if storage_codec(f.read(8)):
+                    f.seek(0)
+                    zf.writestr(arcname, f.read(), compress_type=zipfile.ZIP_STORED)
+                    return
+        # সাধারণ JSON এ ফাইল নয়, মেমরির স্ন্যাপশট লেখা হয় — ব্যাকআপ চলাকালীন রাইট আটকায় না, আর অর্ধেক লেখা অবস্থাও আসে না
+        with self._snapshot(path) as view:
+            zf.writestr(arcname, json.dumps(view, indent=4))
+
+    def get_backups(self):
+        try:
+            return [f for f in os.listdir(self.backup_dir) if f.endswith('.zip')]
+        except Exception as e:
+            print(f"DEBUG ERROR: get_backups failed: {e}")
+            return []
+
+    def restore_backup(self, filepath):
+        print(f"DEBUG: Restoring backup from {filepath}")
+        try:
+            target_path = self.get_user_path()
+            self.flush()
+            with zipfile.ZipFile(filepath, 'r') as zip_ref:
+                zip_ref.extractall(target_path)
+            for path in [p for p in self._docs if os.path.dirname(p) == target_path]: self._evict(path)
+            with self._catalog_guard: self._catalogs.pop(target_path, None)
+            return True, "Restore Successful!"
+        except Exception as e:
+            print(f"DEBUG ERROR: restore_backup failed: {e}")
+            return False, str(e)
+            
+    def _api_users(self):
+        # auth ফাইল বদলালেই কেবল আবার পড়া হয়, প্রতি রিকোয়েস্টে নয়
+        mtime = os.stat(self.auth_file).st_mtime_ns
+        if getattr(self, "_users_mtime", None) != mtime:
+            with open(self.auth_file, 'r') as f: self._users_cache = json.load(f)
+            self._users_mtime = mtime
+        return self._users_cache
+
+    def authenticate_api_user(self, user, password):
+        try:
+            for u in self._api_users():
+                if u['user'] == user and u['pass'] == password:
+                    if 'uid' not in u: u['uid'] = str(uuid.uuid4())
+                    return u
+        except Exception as e:
+            print(f"DEBUG ERROR: authenticate_api_user failed: {e}")
+        return None
+
+    def set_user_limits(self, user, limits):
+        # টেন্যান্টের API সীমা (rate, burst, max_inflight) অথ রেকর্ডে রাখে
+        try:
+            with open(self.auth_file, 'r') as f: users = json.load(f)
+            found = False
+            for u in users:
+                if u['user'] == user:
+                    u['limits'] = {k: v for k, v in limits.items() if k in DEFAULT_LIMITS}
+                    found = True
+            if not found: return False
+            with open(self.auth_file, 'w') as f: json.dump(users, f)
+            return True
+        except Exception as e:
+            print(f"DEBUG ERROR: set_user_limits failed: {e}")
+            return False
+
+class LazyEngine:
+    # প্রথম ব্যবহারে BackendEngine বানায়, যাতে ইমপোর্টের সময় ডিস্কের কাজ না হয়; ready() আগেভাগে পেছনে চালু করে
+    def __init__(self, factory=BackendEngine):
+        self._factory = factory
+        self._engine = None
+        self._init_lock = threading.Lock()
+
+    def ready(self):
+        if self._engine is None:
+            with self._init_lock:
+                if self._engine is None:
+                    t = time.perf_counter()
+                    try:
+                        self._engine = self._factory()
+                    except Exception as e:
+                        print(f"DEBUG CRITICAL: Engine Init Failed: {e}")
+                        traceback.print_exc()
+                        raise
+                    print(f"DEBUG: Engine ready in {(time.perf_counter() - t) * 1000:.0f} ms")
+        return self._engine
+
+    def __getattr__(self, name):
+        return getattr(self.ready(), name)
+
+    def shutdown(self):
+        # কখনো ব্যবহার না হলে বন্ধ করার সময় শুধু শুধু তৈরি করা হয় না
+        if self._engine is not None: self._engine.shutdown()
+
+engine = LazyEngine()
+atexit.register(engine.shutdown)
+
+limiter = TenantLimiter()
+write_queue = FairWriteQueue()
+REPLICA = None  # ফলোয়ার মোডে ReplicaFollower; তখন API শুধু পড়ার জন্য
+WRITE_ACTIONS = ("insert", "update", "bulk_insert", "create_index", "drop_index", "set_ttl", "set_compression") + FIELD_OPS
+
+# --- HTTP কম্প্রেশন ---
+class _InflatingStream(io.RawIOBase):
+    # gzip/deflate বডি দরকারমতো খোলে, তাই স্ট্রিম ইমপোর্ট স্ট্রিমই থাকে
+    def __init__(self, raw, limit=None):
+        self.raw, self.limit, self.total = raw, limit or MAX_INFLATED_BODY, 0
+        # 32 + MAX_WBITS: gzip ও zlib হেডার দুটোই নিজে চিনে নেয়
+        self.inflater = zlib.decompressobj(32 + zlib.MAX_WBITS)
+        self.pending = b""
+
+    def readable(self): return True
+
+    def readinto(self, b):
+        while not self.pending:
+            chunk = self.raw.read(64 * 1024)
+            try:
+                self.pending = self.inflater.decompress(chunk) if chunk else self.inflater.flush()
+            except zlib.error as e:
+                raise BadRequest(f"Invalid compressed body: {e}")
+            if not chunk and not self.pending: return 0
+        n = min(len(b), len(self.pending))
+        b[:n], self.pending = self.pending[:n], self.pending[n:]
+        self.total += n
+        if self.total > self.limit: raise RequestEntityTooLarge("Decompressed body too large")
+        return n
+
+class _InflateRequests:
+    # WSGI মিডলওয়্যার: Content-Encoding gzip|deflate বডি গ্রহণ করে
+    def __init__(self, app): self.app = app
+
+    def __call__(self, environ, start_response):
+        if environ.get("HTTP_CONTENT_ENCODING", "").strip().lower() in ("gzip", "x-gzip", "deflate"):
+            environ["wsgi.input"] = io.BufferedReader(_InflatingStream(get_input_stream(environ)))
+            # খোলা বডির দৈর্ঘ্য অজানা; স্ট্রিম শেষ পর্যন্ত পড়তে দেওয়া হয়
+            environ["wsgi.input_terminated"] = True
+            environ.pop("CONTENT_LENGTH", None)
+            environ.pop("HTTP_CONTENT_ENCODING", None)
+        return self.app(environ, start_response)
+
+server.wsgi_app = _InflateRequests(server.wsgi_app)
+
+def pick_encoding(accept):
+    # Accept-Encoding এ অনুমোদিত br/gzip/deflate এর সেরাটা, নইলে None
+    if COMPRESS_LEVEL <= 0 or not accept: return None
+    q = {}
+    for part in accept.lower().split(","):
+        name, _, params = part.strip().partition(";")
+        try: q[name.strip()] = float(params.strip()[2:]) if params.strip().startswith("q=") else 1.0
+        except ValueError: q[name.strip()] = 0.0
+    best = None
+    for enc in (("br",) if brotli else ()) + ("gzip", "deflate"):
+        weight = q.get(enc, q.get("*", 0.0))
+        if weight > 0 and (best is None or weight > best[1]): best = (enc, weight)
+    return best[0] if best else None
+
+def _compressor(enc):
+    if enc == "br":
+        c = brotli.Compressor(quality=min(COMPRESS_LEVEL, 11))
+        return c.process, c.finish
+    c = zlib.compressobj(COMPRESS_LEVEL, zlib.DEFLATED, 31 if enc == "gzip" else zlib.MAX_WBITS)
+    return c.compress, c.flush
+
+def _compress_chunks(chunks, enc):
+    compress, finish = _compressor(enc)
+    try:
+        for chunk in chunks:
+            out = compress(chunk.encode() if isinstance(chunk, str) else chunk)
+            if out: yield out
+        yield finish()
+    finally:
+        if hasattr(chunks, "close"): chunks.close()
+
+@server.after_request
+def compress_response(resp):
+    if resp.status_code < 200 or resp.status_code in (204, 304) or "Content-Encoding" in resp.headers: return resp
+    resp.vary.add("Accept-Encoding")
+    # SSE আর ইমপোর্ট-প্রোগ্রেসের মতো লাইভ স্ট্রিম জমিয়ে কম্প্রেস করলে ক্লায়েন্ট দেরিতে পায়
+    if resp.headers.get("X-Accel-Buffering") == "no": return resp
+    enc = pick_encoding(request.headers.get("Accept-Encoding"))
+    if not enc: return resp
+    if resp.is_streamed:
+        resp.response = _compress_chunks(resp.response, enc)
+        resp.headers.pop("Content-Length", None)
+    else:
+        body = resp.get_data()
+        if len(body) < COMPRESS_MIN_SIZE: return resp
+        compress, finish = _compressor(enc)
+        resp.set_data(compress(body) + finish())
+    resp.headers["Content-Encoding"] = enc
+    return resp
+
+@server.errorhandler(HTTPException)
+def http_error(e):
+    # সব রুটই /api; HTML পাতার বদলে বাকি উত্তরের মতো JSON, কিন্তু আসল স্ট্যাটাস কোড রেখে
+    return jsonify({"status": "error", "msg": e.description}), e.code
+
+# --- FLASK API ---
+@server.route('/api', methods=['POST'])
+def api_handler():
+    if not SERVER_ACTIVE: return jsonify({"status": "error", "msg": "Server is Stopped"}), 503
+    try:
+        data = request.json
+        user_obj = engine.authenticate_api_user(data.get('user'), data.get('pass'))
+        
+        if not user_obj:
+            return jsonify({"status": "error", "msg": "Auth Failed"}), 401
+        
+        if REPLICA and data.get('action') in WRITE_ACTIONS:
+            return jsonify({"status": "error", "msg": "Read-only replica", "primary": REPLICA.primary}), 403
+        
+        ok, retry, msg = limiter.acquire(user_obj)
+        if not ok:
+            return jsonify({"status": "error", "msg": msg}), 429, {"Retry-After": str(max(1, int(retry + 0.999)))}
+        try:
+            if data.get('action') in WRITE_ACTIONS:
+                with write_queue.turn(user_obj['uid']): return handle_action(data, user_obj)
+            return handle_action(data, user_obj)
+        finally:
+            limiter.release(user_obj)
+    except HTTPException:
+        # ভাঙা বা অতিরিক্ত বড় বডির 400/413 ফ্লাস্ক নিজের স্ট্যাটাস কোডসহ পাঠাবে
+        raise
+    except Exception as e:
+        print(f"DEBUG ERROR: API Handler failed: {e}")
+        return jsonify({"status": "error", "msg": str(e)})
+
+def handle_action(data, user_obj):
+    action = data.get('action')
+    db, table = data.get('db'), data.get('table')
+    
+    if action == "get":
+        if data.get('if_version') is not None and engine.get_table_version(db, table, user_obj=user_obj) == int(data['if_version']):
+            return jsonify({"status": "not_modified", "version": int(data['if_version'])})
+        since = data.get('since_version')
+        res = engine.read_table(db, table, since_version=None if since is None else int(since), user_obj=user_obj)
+        if res is None: return jsonify({"status": "success", "columns": [], "data": [], "version": 0})
+        c = res["columns"]
+        rows_list = [[r.get(col, "") for col in c] for r in res["rows"]]
+        out = {"status": "success", "columns": c, "data": rows_list, "version": res["version"]}
+        # ডেল্টা রিপ্লাই: আগে "deleted" আইডি গুলো মুছে তারপর "data" upsert করতে হবে
+        if since is not None: out.update(delta=not res["full"], deleted=res["deleted"])
+        return jsonify(out)
+    elif action == "insert":
+        ok, res = engine.insert_data(db, table, data.get('row'), user_obj=user_obj)
+        if ok: return jsonify({"status": "success", "id": res})
+        return jsonify({"status": "error", "msg": res})
+    elif action == "bulk_insert":
+        ok, ids, errors = engine.insert_many(db, table, data.get('rows') or [], user_obj=user_obj, skip_invalid=bool(data.get('skip_invalid')))
+        # skip_invalid এ খারাপ রো গুলো বাদ যায়; "errors" = [[অবস্থান, কারণ]], বাকিদের id ক্রমানুসারে "ids" এ
+        if ok: return jsonify({"status": "success", "ids": ids, "errors": errors})
+        return jsonify({"status": "error", "msg": ids})
+    elif action == "update":
+        row_id = data.get('id')
+        new_data = data.get('data')
+        ok, msg = engine.update_row_data(db, table, row_id, new_data, user_obj=user_obj)
+        return jsonify({"status": "success" if ok else "error", "msg": msg})
+    elif action in FIELD_OPS:
+        col = data.get('column')
+        ok, msg, row = engine.field_op(db, table, data.get('id'), col, action, data.get('value'),
+                                       data['expected'] if 'expected' in data else _UNSET, data.get('expected_version'), user_obj=user_obj)
+        # conflict এ বর্তমান মান আর রো-ভার্সন ফেরত যায়, যাতে ক্লায়েন্ট সেটা দিয়ে আবার চেষ্টা করতে পারে
+        out = {"status": "success" if ok else "conflict" if row is not None else "error", "msg": msg}
+        if row is not None: out.update(value=row.get(col), row_version=row.get("_ver"))
+        return jsonify(out)
+    elif action == "search":
+        c, hits = engine.search_rows(db, table, data.get('q', ''), limit=int(data.get('limit', 20)), user_obj=user_obj)
+        out = {"status": "success", "ids": [str(r.get("id")) for r, _ in hits], "scores": [round(score, 4) for _, score in hits]}
+        if data.get('with_rows'): out.update(columns=c, data=[[r.get(col, "") for col in c] for r, _ in hits])
+        return jsonify(out)
+    elif action == "join":
+        c, r = engine.join(db, table, data.get('right'), data.get('on'), columns=data.get('columns'), where=data.get('where'),
+                           how=data.get('how', "inner"), limit=int(data.get('limit') or 0), user_obj=user_obj)
+        return jsonify({"status": "success", "columns": c, "data": r})
+    elif action in ("create_index", "drop_index"):
+        fn = engine.create_index if action == "create_index" else engine.drop_index
+        ok, msg = fn(db, table, data.get('column'), user_obj=user_obj)
+        return jsonify({"status": "success" if ok else "error", "msg": msg})
+    elif action == "set_ttl":
+        ok, msg = engine.set_ttl(db, table, data.get('seconds'), data.get('column'), user_obj=user_obj)
+        return jsonify({"status": "success" if ok else "error", "msg": msg})
+    elif action == "set_compression":
+        ok, msg = engine.set_compression(db, data.get('codec'), user_obj=user_obj)
+        return jsonify({"status": "success" if ok else "error", "msg": msg})
+    elif action == "stats":
+        return jsonify({"status": "success", "dbs": engine.get_stats(db, user_obj=user_obj)})
+    elif action == "aggregate":
+        c, r = engine.aggregate(db, table, data.get('aggs'), where=data.get('where'), group_by=data.get('group_by'), user_obj=user_obj)
+        return jsonify({"status": "success", "columns": c, "data": r})
+            
+    return jsonify({"status": "error", "msg": "Invalid Action"})
+
+def _stream_auth(params):
+    if not SERVER_ACTIVE: return None, (jsonify({"status": "error", "msg": "Server is Stopped"}), 503)
+    user_obj = engine.authenticate_api_user(params.get('user'), params.get('pass'))
+    if not user_obj: return None, (jsonify({"status": "error", "msg": "Auth Failed"}), 401)
+    # ফিড কানেকশন দীর্ঘক্ষণ খোলা থাকে, তাই শুধু রেট লিমিট গোনা হয়, in-flight নয়
+    ok, retry, msg = limiter.acquire(user_obj)
+    if not ok: return None, (jsonify({"status": "error", "msg": msg}), 429, {"Retry-After": str(max(1, int(retry + 0.999)))})
+    limiter.release(user_obj)
+    return user_obj, None
+
+def _request_params():
+    # যেসব রুটের বডি সাধারণ JSON নয়, তাদের অথ আর অপশন
+    params = dict(request.args)
+    if request.mimetype == "multipart/form-data": params.update(request.form)
+    if request.headers.get('X-BanglaDB-User'):
+        params.update(user=request.headers['X-BanglaDB-User'], **{"pass": request.headers.get('X-BanglaDB-Pass')})
+    return params
+
+@server.route('/api/import', methods=['POST'])
+def import_handler():
+    # CSV/NDJSON বডি (সরাসরি বা multipart "file") টেবিলে স্ট্রিম করে, প্রতি চাঙ্কে একটা কমিট
+    try:
+        params = _request_params()
+        user_obj, err = _stream_auth(params)
+        if err: return err
+        if REPLICA: return jsonify({"status": "error", "msg": "Read-only replica", "primary": REPLICA.primary}), 403
+        upload = request.files.get('file')
+        stream = upload.stream if upload else request.stream
+        fmt = params.get('format') or {"text/csv": "csv", "application/x-ndjson": "ndjson", "application/jsonl": "ndjson"}.get(request.mimetype)
+        fmt = detect_format(fmt, upload.filename if upload else "")
+        records = iter_csv(stream) if fmt == "csv" else iter_ndjson(stream)
+        db, table = params.get('db'), params.get('table')
+        create = params.get('create') in ("1", "true", "yes")
+        chunk = max(1, min(int(params.get('chunk', IMPORT_CHUNK)), 50000))
+        guard = lambda: write_queue.turn(user_obj['uid'])
+        
+        steps = engine.iter_import(db, table, records, chunk, create, guard=guard, user_obj=user_obj)
+        if params.get('progress') in ("1", "true", "yes"):
+            # প্রতি চাঙ্ক শেষে এক লাইন NDJSON প্রোগ্রেস, শেষ লাইনে সারাংশ
+            def stream_progress():
+                try:
+                    last = None
+                    for last in steps: yield json.dumps(dict(last, status="progress")) + "\n"
+                    yield json.dumps(dict(last or {}, status="success")) + "\n"
+                except Exception as e:
+                    yield json.dumps({"status": "error", "msg": str(e)}) + "\n"
+            return Response(stream_with_context(stream_progress()), mimetype="application/x-ndjson", headers={"X-Accel-Buffering": "no"})
+        summary = None
+        for summary in steps: pass
+        return jsonify(dict(summary, status="success"))
+    except HTTPException:
+        raise
+    except Exception as e:
+        print(f"DEBUG ERROR: Import Handler failed: {e}")
+        return jsonify({"status": "error", "msg": str(e)})
+
+@server.route('/api/export', methods=['GET', 'POST'])
+def export_handler():
+    # পুরো ডাটা মেমরিতে না এনে টেবিল CSV/NDJSON হিসেবে স্ট্রিম করে
+    try:
+        params = _request_params()
+        if request.is_json: params.update(request.json)
+        user_obj, err = _stream_auth(params)
+        if err: return err
+        db, table = params.get('db'), params.get('table')
+        fmt = detect_format(params.get('format') or "ndjson")
+        if table not in engine.get_tables(db, user_obj): return jsonify({"status": "error", "msg": "Table not found"}), 404
+        mimetype = "text/csv" if fmt == "csv" else "application/x-ndjson"
+        return Response(stream_with_context(engine.export_rows(db, table, fmt, user_obj=user_obj)), mimetype=mimetype,
+                        headers={"Content-Disposition": f'attachment; filename="{table}.{fmt}"'})
+    except HTTPException:
+        raise
+    except Exception as e:
+        print(f"DEBUG ERROR: Export Handler failed: {e}")
+        return jsonify({"status": "error", "msg": str(e)})
+
+@server.route('/api/changes', methods=['POST'])
+def changes_handler():
+    # লং-পোল: since এর পরের ইভেন্ট এলেই উত্তর, নইলে timeout শেষে
+    try:
+        data = request.json
+        user_obj, err = _stream_auth(data)
+        if err: return err
+        since = data.get('since')
+        timeout = min(float(data.get('timeout', LONG_POLL_TIMEOUT)), LONG_POLL_TIMEOUT)
+        key = (user_obj['uid'], data.get('db'), data.get('table'))
+        evs, cursor, reset = engine.feed.wait(key, None if since is None else int(since), data.get('epoch'), timeout, int(data.get('limit', 500)))
+        return jsonify({"status": "success", "epoch": engine.feed.epoch, "seq": cursor, "reset": reset, "events": evs})
+    except HTTPException:
+        raise
+    except Exception as e:
+        print(f"DEBUG ERROR: Changes Handler failed: {e}")
+        return jsonify({"status": "error", "msg": str(e)})
+
+@server.route('/api/changes/stream', methods=['GET'])
+def changes_stream():
+    # /api/changes এর SSE রূপ; Last-Event-ID বা ?since= থেকে আবার শুরু
+    try:
+        args = request.args
+        user_obj, err = _stream_auth(args)
+        if err: return err
+        key = (user_obj['uid'], args.get('db'), args.get('table'))
+        since = request.headers.get('Last-Event-ID') or args.get('since')
+        since = None if since is None else int(since)
+        epoch = args.get('epoch')
+    except HTTPException:
+        raise
+    except Exception as e:
+        print(f"DEBUG ERROR: Changes Stream failed: {e}")
+        return jsonify({"status": "error", "msg": str(e)})
+
+    def stream(since):
+        yield f"event: hello\ndata: {json.dumps({'epoch': engine.feed.epoch, 'seq': engine.feed.seq})}\n\n"
+        while SERVER_ACTIVE:
+            evs, cursor, reset = engine.feed.wait(key, since, epoch, 15)
+            if reset:
+                yield f"event: reset\ndata: {json.dumps({'epoch': engine.feed.epoch, 'seq': cursor})}\n\n"
+                return
+            if not evs: yield ": keep-alive\n\n"
+            for ev in evs: yield f"id: {ev['seq']}\nevent: change\ndata: {json.dumps(ev)}\n\n"
+            since = cursor
+    return Response(stream(since), mimetype="text/event-stream", headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
+@server.route('/api/replication/log', methods=['POST'])
+def replication_log():
+    # ইউজারের সব ডাটাবেস আর টেবিলের প্রতিটা পরিবর্তনের লং-পোল
+    try:
+        data = request.json
+        user_obj, err = _stream_auth(data)
+        if err: return err
+        since = data.get('since')
+        timeout = min(float(data.get('timeout', LONG_POLL_TIMEOUT)), LONG_POLL_TIMEOUT)
+        evs, cursor, reset = engine.feed.wait((user_obj['uid'],), None if since is None else int(since), data.get('epoch'), timeout, int(data.get('limit', 1000)))
+        return jsonify({"status": "success", "epoch": engine.feed.epoch, "seq": cursor, "head": engine.feed.seq, "reset": reset, "events": evs})
+    except HTTPException:
+        raise
+    except Exception as e:
+        print(f"DEBUG ERROR: Replication Log failed: {e}")
+        return jsonify({"status": "error", "msg": str(e)})
+
+@server.route('/api/replication/snapshot', methods=['POST'])
+def replication_snapshot():
+    # db না দিলে ডাটাবেসের তালিকা আর লগের অবস্থান, db দিলে পুরো ডাটাবেস
+    try:
+        data = request.json
+        user_obj, err = _stream_auth(data)
+        if err: return err
+        db = data.get('db')
+        if not db:
+            return jsonify({"status": "success", "uid": user_obj['uid'], "epoch": engine.feed.epoch, "seq": engine.feed.seq, "dbs": engine.get_databases(user_obj)})
+        if db not in engine.get_databases(user_obj): return jsonify({"status": "error", "msg": "Database not found"}), 404
+        doc, seq = engine.snapshot_db(db, user_obj)
+        # ডকুমেন্ট আবার পার্স/এনকোড না করে সরাসরি বসানো হয়
+        body = f'{{"status":"success","epoch":{json.dumps(engine.feed.epoch)},"seq":{seq},"doc":{doc}}}'
+        return Response(body, mimetype="application/json")
+    except HTTPException:
+        raise
+    except Exception as e:
+        print(f"DEBUG ERROR: Replication Snapshot failed: {e}")
+        return jsonify({"status": "error", "msg": str(e)})
+
+@server.route('/api/replication/status', methods=['GET', 'POST'])
+def replication_status():
+    if REPLICA: return jsonify(dict(REPLICA.status(), status="success"))
+    return jsonify({"status": "success", "role": "primary", "epoch": engine.feed.epoch, "seq": engine.feed.seq})
+
+class ReplicaFollower:
+    # প্রাইমারির রেপ্লিকেশন লগ পড়ে লোকাল ইঞ্জিনে চালায়
+    # শুরুতে বা গ্যাপ হলে সব ডাটাবেস স্ন্যাপশট থেকে কপি; স্কিমা বদলালে শুধু সেই ডাটাবেস আবার কপি
+    def __init__(self, primary, user, password, poll_timeout=20):
+        self.primary = primary.rstrip("/")
+        self.user, self.password = user, password
+        self.poll_timeout = poll_timeout
+        self.user_obj = None
+        self.cursor = None
+        self.epoch = None
+        self.head = 0
+        self.last_applied_ts = None
+        self.last_contact = None
+        self.error = None
+
+    def _post(self, route, payload, timeout=30):
+        body = json.dumps(dict(payload, user=self.user, **{"pass": self.password})).encode()
+        req = urllib.request.Request(self.primary + route, data=body, headers={"Content-Type": "application/json", "Accept-Encoding": "gzip"})
+        try:
+            with urllib.request.urlopen(req, timeout=timeout) as resp: res = json.loads(self._body(resp))
+        except urllib.error.HTTPError as e:
+            res = json.loads(self._body(e) or b"{}")
+            res.setdefault("code", e.code)
+        self.last_contact = time.time()
+        return res
+
+    @staticmethod
+    def _body(resp):
+        data = resp.read()
+        return gzip.decompress(data) if resp.headers.get("Content-Encoding") == "gzip" else data
+
+    def status(self):
+        behind = self.cursor is None or self.cursor < self.head
+        return {
+            "role": "replica", "primary": self.primary,
+            "applied_seq": self.cursor, "primary_seq": self.head,
+            "lag_events": max(0, self.head - (self.cursor or 0)),
+            "lag_seconds": round(time.time() - self.last_applied_ts, 3) if behind and self.last_applied_ts else 0,
+            "last_contact_age": round(time.time() - self.last_contact, 3) if self.last_contact else None,
+            "error": self.error,
+        }
+
+    def _copy_db(self, db):
+        res = self._post("/api/replication/snapshot", {"db": db})
+        if res.get("status") == "success": engine.install_snapshot(db, res["doc"], self.user_obj)
+        elif res.get("code") == 404: engine.delete_db(db, self.user_obj)
+        else: raise IOError(res.get("msg", "snapshot failed"))
+
+    def full_resync(self):
+        info = self._post("/api/replication/snapshot", {})
+        if info.get("status") != "success": raise IOError(info.get("msg", "snapshot failed"))
+        engine.ensure_user(self.user, self.password, info["uid"])
+        self.user_obj = {"user": self.user, "uid": info["uid"]}
+        for db in engine.get_databases(self.user_obj):
+            if db not in info["dbs"]: engine.delete_db(db, self.user_obj)
+        for db in info["dbs"]: self._copy_db(db)
+        self.cursor, self.epoch, self.head = info["seq"], info["epoch"], info["seq"]
+        print(f"DEBUG: Replica synced {len(info['dbs'])} databases at seq {self.cursor}")
+
+    def step(self):
+        if self.cursor is None: return self.full_resync()
+        res = self._post("/api/replication/log", {"since": self.cursor, "epoch": self.epoch, "timeout": self.poll_timeout}, timeout=self.poll_timeout + 10)
+        if res.get("status") != "success": raise IOError(res.get("msg", "log fetch failed"))
+        self.head = res["head"]
+        if res["reset"]:
+            print("DEBUG: Replica fell behind the primary's log, resyncing")
+            self.cursor = None
+            return
+        recopy, by_table = set(), OrderedDict()
+        for ev in res["events"]:
+            db, table = ev["db"], ev["table"]
+            if table is None:
+                if ev["op"] == "drop_db":
+                    engine.delete_db(db, self.user_obj)
+                    recopy.discard(db)
+                    for key in [k for k in by_table if k[0] == db]: del by_table[key]
+                else: recopy.add(db)
+            elif ev["op"] in ("insert", "update", "delete"): by_table.setdefault((db, table), []).append(ev)
+            else: recopy.add(db)
+        for (db, table), evs in by_table.items():
+            if db not in recopy and not engine.apply_replication(db, table, evs, self.user_obj): recopy.add(db)
+        for db in recopy: self._copy_db(db)
+        if res["events"]: self.last_applied_ts = res["events"][-1]["ts"]
+        self.cursor = res["seq"]
+
+    def run(self):
+        backoff = 1
+        while True:
+            try:
+                self.step()
+                self.error, backoff = None, 1
+            except Exception as e:
+                self.error = str(e)
+                print(f"DEBUG ERROR: Replication step failed: {e}")
+                time.sleep(backoff)
+                backoff = min(backoff * 2, 30)
+
+    def start(self):
+        threading.Thread(target=self.run, daemon=True).start()
+        return self
+
+def run_flask(host='0.0.0.0', port=5000, fd=None):
+    print("DEBUG: Starting Flask Server...")
+    try:
+        # fd = prefork() এর শেয়ার করা সকেট; প্রতিটি ওয়ার্কার সেখান থেকেই কানেকশন নেয়
+        if fd is not None: make_server(host, port, server, threaded=True, fd=fd).serve_forever()
+        else: server.run(host=host, port=port, threaded=True)
+    except Exception as e:
+        print(f"DEBUG CRITICAL: Flask Server Failed: {e}")
+
+def prefork(host, port, workers):
+    # পোর্ট একবার বাইন্ড করে workers টা প্রসেস ফর্ক করে; প্রতিটা ওয়ার্কার সকেটের fd পায়
+    # প্যারেন্ট ফেরে না: মরে যাওয়া ওয়ার্কার আবার চালায়, SIGTERM/SIGINT এ সবাইকে থামিয়ে বের হয়
+    if fcntl is None or not hasattr(os, "fork"): raise SystemExit("--workers needs a Unix-like OS (fork and flock)")
+    family = socket.getaddrinfo(host, port, type=socket.SOCK_STREAM)[0][0]
+    sock = socket.socket(family, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(128)
+    sock.set_inheritable(True)
+    children, stopping = {}, []
+
+    def spawn():
+        pid = os.fork()
+        if pid == 0:
+            # Ctrl+C পুরো গ্রুপে যায়; ওয়ার্কার বন্ধ হবে পেরেন্টের SIGTERM এ, atexit ফ্লাশ চালিয়ে
+            signal.signal(signal.SIGINT, signal.SIG_IGN)
+            signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+            return True
+        children[pid] = time.time()
+        return False
+
+    def stop(*_):
+        stopping.append(True)
+        for pid in list(children):
+            try: os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError: pass
+
+    for _ in range(workers):
+        # detach: সকেট অবজেক্ট মুছে গেলেও fd খোলা থাকে, ওয়ার্কার সেটাই ব্যবহার করে
+        if spawn(): return sock.detach()
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGINT, stop)
+    print(f"DEBUG: Serving on {host}:{port} with {workers} worker processes: {sorted(children)}")
+    while children:
+        try: pid, status = os.wait()
+        except ChildProcessError: break
+        started = children.pop(pid, None)
+        if started is None or stopping: continue
+        print(f"DEBUG ERROR: Worker {pid} exited with status {status}, restarting")
+        # জন্মেই মরে গেলে (যেমন ভুল কনফিগ) একটু থেমে আবার, যাতে CPU তে লুপ না ঘোরে
+        if time.time() - started < 1: time.sleep(1)
+        if spawn(): return sock.detach()
+    sys.exit(0)
+
+def get_ip():
+    try:
+        s = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        s.connect(("8.8.8.8", 80))
+        ip = s.getsockname()[0]; s.close()
+        return ip
+    except Exception as e:
+        print(f"DEBUG ERROR: get_ip failed: {e}")
+        return "127.0.0.1"
+
+# ==========================================
+# হেডলেস মোড: python backend.py serve | follow
+# ==========================================
+def main(argv=None):
+    global engine, REPLICA, SERVER_ACTIVE, COMPRESS_LEVEL, STORAGE_COMPRESSION
+    parser = argparse.ArgumentParser(description="Run the BanglaDB API without the app UI.")
+    sub = parser.add_subparsers(dest="mode", required=True)
+    serve = sub.add_parser("serve", help="serve the /api as a primary")
+    follow = sub.add_parser("follow", help="serve read-only traffic replicated from a primary")
+    serve.add_argument("--workers", type=int, default=1, help="worker processes sharing the port (Linux/macOS), 0 = one per CPU core")
+    follow.add_argument("--primary", required=True, help="e.g. http://192.168.0.10:5000")
+    follow.add_argument("--user", required=True)
+    follow.add_argument("--pass", dest="password", required=True)
+    for p in (serve, follow):
+        p.add_argument("--host", default="0.0.0.0")
+        p.add_argument("--port", type=int, default=5000)
+        p.add_argument("--data-dir", default=".", help="where BanglaDB_Data and the auth file live")
+        p.add_argument("--durability", choices=WriteCoalescer.MODES, default=DURABILITY_MODE)
+        p.add_argument("--storage-compression", choices=list(STORAGE_CODECS), help="store new databases compressed on disk")
+        p.add_argument("--compress-level", type=int, choices=range(10), default=COMPRESS_LEVEL, metavar="0-9", help="HTTP response compression, 0 = off")
+    args = parser.parse_args(argv)
+    COMPRESS_LEVEL = args.compress_level
+    STORAGE_COMPRESSION = args.storage_compression
+    
+    fd, workers = None, getattr(args, "workers", 1) or os.cpu_count() or 1
+    # পেরেন্ট prefork() এর ভেতরেই থেকে ওয়ার্কারদের দেখাশোনা করে; নিচের অংশ শুধু ওয়ার্কারে চলে
+    # (ফর্কের আগে কোনো থ্রেড/ইঞ্জিন তৈরি হয় না)
+    if workers > 1: fd = prefork(args.host, args.port, workers)
+    engine = BackendEngine(args.data_dir)
+    engine.shared = fd is not None
+    atexit.register(engine.shutdown)
+    engine.set_durability(args.durability)
+    if args.mode == "follow":
+        # রেপ্লিকা নিজে রো মোছে না; প্রাইমারির সুইপারের delete ইভেন্ট আসে, ততক্ষণ রিডে লুকানো থাকে
+        engine.expire_rows = False
+        REPLICA = ReplicaFollower(args.primary, args.user, args.password).start()
+    SERVER_ACTIVE = True
+    run_flask(args.host, args.port, fd)
+
+if __name__ == "__main__":
+    main()
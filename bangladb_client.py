@@ -0,0 +1,278 @@
+# BanglaDB /api এর পাইথন ক্লায়েন্ট, শুধু স্ট্যান্ডার্ড লাইব্রেরি লাগে
+# with Client("http://192.168.0.10:5000", "user", "pass") as db: db.insert("shop", "items", {"name": "চাল", "qty": 5})
+# কানেকশন পুলে keep-alive থাকে, insert_later এর রো bulk_insert এ একসাথে যায়, ব্যর্থ কল backoff দিয়ে রিট্রাই হয়
+import json
+import gzip
+import zlib
+import time
+import random
+import asyncio
+import functools
+import threading
+import http.client
+from contextlib import contextmanager
+from concurrent.futures import Future, ThreadPoolExecutor, wait as wait_futures
+from urllib.parse import urlsplit
+
+# backend.WRITE_ACTIONS এর মতো; সার্ভারে পৌঁছানোর পর উত্তর হারালে এগুলো আবার পাঠানো হয় না (দুবার লেখা এড়াতে)
+WRITE_ACTIONS = ("insert", "update", "bulk_insert", "create_index", "drop_index", "set_ttl", "set_compression", "incr", "decr", "append", "cas")
+# এই স্ট্যাটাসে সার্ভার রিকোয়েস্টটা চালায়নি (রেট লিমিট / সার্ভার বন্ধ), তাই রাইটও আবার পাঠানো নিরাপদ
+RETRY_SAFE_STATUS = (429, 503)
+# এর চেয়ে বড় রিকোয়েস্ট বডি gzip করে পাঠানো হয়
+COMPRESS_MIN_SIZE = 1024
+_UNSET = object()
+
+
+class BanglaDBError(Exception):
+    # সার্ভার যে কল ফিরিয়ে দিয়েছে (বা বারবার ব্যর্থ); status = HTTP স্ট্যাটাস, reply = JSON উত্তর
+
+    def __init__(self, msg, status=None, reply=None):
+        super().__init__(msg)
+        self.status = status
+        self.reply = reply or {}
+
+
+class _Pool:
+    # এক সার্ভারের keep-alive কানেকশন, একসাথে সর্বোচ্চ size টা ব্যবহারে
+
+    def __init__(self, url, size, timeout):
+        parts = urlsplit(url if "://" in url else f"http://{url}")
+        self.conn_cls = http.client.HTTPSConnection if parts.scheme == "https" else http.client.HTTPConnection
+        self.host, self.port, self.timeout = parts.hostname, parts.port, timeout
+        path = parts.path.rstrip("/")
+        self.path = path if path.endswith("/api") else f"{path}/api"
+        self.slots = threading.BoundedSemaphore(size)
+        self.idle = []
+        self.lock = threading.Lock()
+
+    @contextmanager
+    def connection(self):
+        self.slots.acquire()
+        try:
+            # সবচেয়ে সম্প্রতি ব্যবহৃত কানেকশন আগে, যাতে সার্ভার সেটা বন্ধ করে দেওয়ার সম্ভাবনা কম থাকে
+            with self.lock: conn = self.idle.pop() if self.idle else None
+            if conn is None:
+                conn = self.conn_cls(self.host, self.port, timeout=self.timeout)
+                conn.reused = False
+            try:
+                yield conn
+            except BaseException:
+                conn.close()
+                raise
+            conn.reused = True
+            with self.lock: self.idle.append(conn)
+        finally:
+            self.slots.release()
+
+    def close(self):
+        with self.lock:
+            for conn in self.idle: conn.close()
+            self.idle.clear()
+
+
+class Client:
+    # ব্লকিং ক্লায়েন্ট, থ্রেডগুলো শেয়ার করতে পারে; কানেকশন এরর, 429 আর 5xx এ backoff দিয়ে retries বার রিট্রাই
+    # রাইট শুধু তখনই আবার যায় যখন সার্ভার সেটা চালাতে পারেনি; পাঠানোর পর কানেকশন গেলে BanglaDBError
+    # insert_later এর রো batch_size জমলে বা প্রথমটার batch_delay সেকেন্ড পরে যায়
+
+    def __init__(self, url, user, password, pool_size=8, timeout=30, retries=5, backoff=0.1, max_backoff=10,
+                 batch_size=500, batch_delay=0.05, compress=True):
+        self.user, self.password = user, password
+        self.pool_size = pool_size
+        self.pool = _Pool(url, pool_size, timeout)
+        self.retries, self.backoff, self.max_backoff = retries, backoff, max_backoff
+        self.batch_size, self.batch_delay = batch_size, batch_delay
+        self.compress = compress
+        # insert_later এর জমানো রো: (db, table) -> [(row, Future)]
+        self._batches = {}
+        self._batch_cond = threading.Condition()
+        self._batcher = None
+        self._flush_now = False
+        self._closed = False
+
+    def __enter__(self): return self
+
+    def __exit__(self, *exc): self.close()
+
+    # --- Raw calls ---
+    def call(self, action, **payload):
+        # একটা /api অ্যাকশন পাঠিয়ে উত্তর দেয়; "error" উত্তরে BanglaDBError
+        body = json.dumps(dict(payload, action=action, user=self.user, **{"pass": self.password}), ensure_ascii=False).encode()
+        headers = {"Content-Type": "application/json", "Accept-Encoding": "gzip, deflate"}
+        if self.compress and len(body) >= COMPRESS_MIN_SIZE:
+            body = gzip.compress(body, 5)
+            headers["Content-Encoding"] = "gzip"
+        attempt = 0
+        while True:
+            sent, reused, wait_for = False, False, None
+            try:
+                with self.pool.connection() as conn:
+                    reused = conn.reused
+                    conn.request("POST", self.pool.path, body, headers)
+                    sent = True
+                    resp = conn.getresponse()
+                    raw, status = resp.read(), resp.status
+                    retry_after, encoding = resp.getheader("Retry-After"), resp.getheader("Content-Encoding")
+            except (OSError, http.client.HTTPException) as e:
+                # পুরনো keep-alive কানেকশন সার্ভার বন্ধ করে দিলে নতুন কানেকশনে আবার পাঠানো হয়, attempt না গুনে।
+                # কিন্তু রিকোয়েস্ট পাঠানো হয়ে গেলে সার্ভার সেটা চালিয়েছে কিনা জানা যায় না, তাই রাইট আর পাঠানো হয় না
+                stale = reused and isinstance(e, (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError))
+                if stale and (not sent or action not in WRITE_ACTIONS): continue
+                if attempt >= self.retries or (sent and action in WRITE_ACTIONS):
+                    raise BanglaDBError(f"{action} failed: {e}") from e
+            else:
+                if encoding == "gzip": raw = gzip.decompress(raw)
+                elif encoding == "deflate": raw = zlib.decompress(raw)
+                try: reply = json.loads(raw) if raw else {}
+                except ValueError: reply = {"status": "error", "msg": raw[:200].decode(errors="replace")}
+                retryable = status in RETRY_SAFE_STATUS or (status >= 500 and action not in WRITE_ACTIONS)
+                if not retryable or attempt >= self.retries:
+                    if status >= 400 or reply.get("status") == "error":
+                        raise BanglaDBError(reply.get("msg") or f"HTTP {status}", status, reply)
+                    return reply
+                if retry_after:
+                    try: wait_for = float(retry_after)
+                    except ValueError: pass
+            if wait_for is None: wait_for = min(self.max_backoff, self.backoff * 2 ** attempt) * random.uniform(0.5, 1.0)
+            attempt += 1
+            time.sleep(wait_for)
+
+    # --- Convenience wrappers ---
+    def get(self, db, table):
+        # টেবিলের সব রো ডিক্ট হিসেবে
+        reply = self.call("get", db=db, table=table)
+        return [dict(zip(reply["columns"], r)) for r in reply["data"]]
+
+    def get_changes(self, db, table, since_version):
+        # ডেল্টা রিড: "data", "deleted", "delta" আর নতুন "version" সহ পুরো উত্তর
+        return self.call("get", db=db, table=table, since_version=since_version)
+
+    def insert(self, db, table, row):
+        return self.call("insert", db=db, table=table, row=row)["id"]
+
+    def bulk_insert(self, db, table, rows):
+        return self.call("bulk_insert", db=db, table=table, rows=list(rows))["ids"]
+
+    def update(self, db, table, row_id, data):
+        return self.call("update", db=db, table=table, id=row_id, data=data)["msg"]
+
+    def incr(self, db, table, row_id, column, by=1):
+        # সার্ভারে সংখ্যার ফিল্ডে by যোগ করে নতুন মান দেয়
+        return self.call("incr", db=db, table=table, id=row_id, column=column, value=by)["value"]
+
+    def decr(self, db, table, row_id, column, by=1):
+        return self.call("decr", db=db, table=table, id=row_id, column=column, value=by)["value"]
+
+    def append(self, db, table, row_id, column, text):
+        return self.call("append", db=db, table=table, id=row_id, column=column, value=text)["value"]
+
+    def cas(self, db, table, row_id, column, value, expected=_UNSET, expected_version=None):
+        # ফিল্ড এখনো expected থাকলে আর/বা রো expected_version এ থাকলে বদলায়
+        # ফেরত (swapped, value, row_version): সফল হলে নতুন মান, conflict এ বর্তমান মান
+        guard = {} if expected is _UNSET else {"expected": expected}
+        if expected_version is not None: guard["expected_version"] = expected_version
+        reply = self.call("cas", db=db, table=table, id=row_id, column=column, value=value, **guard)
+        return reply["status"] == "success", reply.get("value"), reply.get("row_version")
+
+    def search(self, db, table, q, limit=20, with_rows=False):
+        return self.call("search", db=db, table=table, q=q, limit=limit, with_rows=with_rows)
+
+    def aggregate(self, db, table, aggs, where=None, group_by=None):
+        reply = self.call("aggregate", db=db, table=table, aggs=aggs, where=where, group_by=group_by)
+        return reply["columns"], reply["data"]
+
+    def join(self, db, left, right, on, **opts):
+        reply = self.call("join", db=db, table=left, right=right, on=on, **opts)
+        return reply["columns"], reply["data"]
+
+    def stats(self, db=None):
+        return self.call("stats", db=db)["dbs"]
+
+    # --- Write batching ---
+    def insert_later(self, db, table, row):
+        # ব্যাচ করা bulk_insert এর জন্য রো জমায়; নতুন id এর Future দেয়
+        fut = Future()
+        with self._batch_cond:
+            if self._closed: raise BanglaDBError("Client is closed")
+            buf = self._batches.setdefault((db, table), [])
+            buf.append((row, fut))
+            if self._batcher is None:
+                self._batcher = threading.Thread(target=self._batch_loop, daemon=True)
+                self._batcher.start()
+            if len(buf) == 1 or len(buf) >= self.batch_size: self._batch_cond.notify()
+        return fut
+
+    def flush(self):
+        # জমে থাকা সব insert_later রো এখনই পাঠিয়ে উত্তরের অপেক্ষা করে
+        with self._batch_cond:
+            pending = [f for buf in self._batches.values() for _, f in buf]
+            self._flush_now = True
+            self._batch_cond.notify()
+        wait_futures(pending)
+
+    def _batch_loop(self):
+        while True:
+            with self._batch_cond:
+                while not self._batches:
+                    if self._closed: return
+                    self._batch_cond.wait()
+                # প্রথম রো আসার পর একটু অপেক্ষা, যাতে আরও রো জমে; কোনো টেবিলের ব্যাচ ভরে গেলে সাথে সাথে
+                deadline = time.monotonic() + self.batch_delay
+                while not (self._flush_now or self._closed) and all(len(b) < self.batch_size for b in self._batches.values()):
+                    left = deadline - time.monotonic()
+                    if left <= 0: break
+                    self._batch_cond.wait(left)
+                batches, self._batches, self._flush_now = self._batches, {}, False
+            for (db, table), items in batches.items():
+                for i in range(0, len(items), self.batch_size): self._send_batch(db, table, items[i:i + self.batch_size])
+
+    def _send_batch(self, db, table, items):
+        try:
+            reply = self.call("bulk_insert", db=db, table=table, rows=[row for row, _ in items], skip_invalid=True)
+        except Exception as e:
+            for _, fut in items: fut.set_exception(e)
+            return
+        # খারাপ রো শুধু নিজের Future এ এরর পায়; বাকিদের id ক্রমানুসারে
+        rejected = {pos: msg for pos, msg in reply.get("errors", [])}
+        ids = iter(reply.get("ids", []))
+        for n, (_, fut) in enumerate(items):
+            if n in rejected: fut.set_exception(BanglaDBError(f"Row rejected: {rejected[n]}", reply=reply))
+            else: fut.set_result(next(ids, None))
+
+    def close(self):
+        # জমা রো পাঠিয়ে কানেকশনগুলো বন্ধ করে
+        if self._batcher is not None: self.flush()
+        with self._batch_cond:
+            self._closed = True
+            self._batch_cond.notify()
+        if self._batcher is not None: self._batcher.join()
+        self.pool.close()
+
+
+class AsyncClient:
+    # asyncio এর জন্য একই কল coroutine হিসেবে; pool_size টা থ্রেডে ব্লকিং ক্লায়েন্ট চলে
+    _CALLS = ("call", "get", "get_changes", "insert", "bulk_insert", "update", "incr", "decr", "append", "cas",
+              "search", "aggregate", "join", "stats", "flush")
+
+    def __init__(self, *args, **kwargs):
+        self.client = Client(*args, **kwargs)
+        self._executor = ThreadPoolExecutor(max_workers=self.client.pool_size, thread_name_prefix="bangladb")
+
+    async def __aenter__(self): return self
+
+    async def __aexit__(self, *exc): await self.close()
+
+    def __getattr__(self, name):
+        if name not in self._CALLS: raise AttributeError(name)
+        fn = getattr(self.client, name)
+
+        async def run(*args, **kwargs):
+            return await asyncio.get_running_loop().run_in_executor(self._executor, functools.partial(fn, *args, **kwargs))
+        return run
+
+    def insert_later(self, db, table, row):
+        return asyncio.wrap_future(self.client.insert_later(db, table, row))
+
+    async def close(self):
+        await asyncio.get_running_loop().run_in_executor(self._executor, self.client.close)
+        self._executor.shutdown(wait=False)
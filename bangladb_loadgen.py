@@ -0,0 +1,75 @@
+# BanglaDB সার্ভারের লোড জেনারেটর, bangladb_client.AsyncClient দিয়ে
+# python bangladb_loadgen.py http://127.0.0.1:5000 USER PASS DB TABLE --concurrency 32 --duration 20 --writes 0.2
+# --writes সম্ভাবনায় insert (--no-batch না দিলে insert_later দিয়ে), বাকিটা পুরো টেবিল রিড; শেষে প্রতি অপারেশনের ops/s আর p50/p95/p99
+import sys
+import json
+import time
+import random
+import asyncio
+import argparse
+from bangladb_client import AsyncClient, BanglaDBError
+
+
+def percentile(values, p):
+    if not values: return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * p / 100))]
+
+
+async def worker(db, args, row_template, deadline, stats):
+    n = 0
+    while time.monotonic() < deadline:
+        op = "write" if random.random() < args.writes else "read"
+        t0 = time.perf_counter()
+        try:
+            if op == "read": await db.call("get", db=args.db, table=args.table)
+            else:
+                row = {k: (f"{v} {n}" if isinstance(v, str) else v) for k, v in row_template.items()}
+                if args.no_batch: await db.insert(args.db, args.table, row)
+                else: await db.insert_later(args.db, args.table, row)
+            stats[op].append(time.perf_counter() - t0)
+        except BanglaDBError as e:
+            stats["errors"].append(f"{op}: {e}")
+        n += 1
+
+
+async def run(args):
+    async with AsyncClient(args.url, args.user, args.password, pool_size=args.pool, batch_size=args.batch_size) as db:
+        if args.row: row_template = json.loads(args.row)
+        else:
+            # টেবিলের কলাম থেকে একটা নমুনা রো (সব কলামে টেক্সট)
+            reply = await db.call("get", db=args.db, table=args.table)
+            row_template = {c: "load" for c in reply["columns"] if c != "id"}
+        stats = {"read": [], "write": [], "errors": []}
+        start = time.monotonic()
+        await asyncio.gather(*[worker(db, args, row_template, start + args.duration, stats) for _ in range(args.concurrency)])
+        await db.flush()
+        elapsed = time.monotonic() - start
+    total = len(stats["read"]) + len(stats["write"])
+    print(f"{total} operations in {elapsed:.1f}s = {total / elapsed:.0f} ops/s ({len(stats['errors'])} errors)")
+    for op in ("read", "write"):
+        lat = stats[op]
+        if lat: print(f"  {op:5} {len(lat):7} ops  p50 {percentile(lat, 50) * 1000:7.1f} ms  p95 {percentile(lat, 95) * 1000:7.1f} ms  p99 {percentile(lat, 99) * 1000:7.1f} ms")
+    for err in sorted(set(stats["errors"]))[:5]: print(f"  error: {err}")
+    return 1 if stats["errors"] else 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate read/write load against a BanglaDB /api.")
+    parser.add_argument("url", help="e.g. http://192.168.0.10:5000")
+    parser.add_argument("user")
+    parser.add_argument("password")
+    parser.add_argument("db")
+    parser.add_argument("table")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--duration", type=float, default=10)
+    parser.add_argument("--writes", type=float, default=0.2, help="share of operations that insert a row (0-1)")
+    parser.add_argument("--row", help="JSON row to insert, default: text in every column")
+    parser.add_argument("--pool", type=int, default=8, help="keep-alive connections")
+    parser.add_argument("--batch-size", type=int, default=500)
+    parser.add_argument("--no-batch", action="store_true", help="send every insert as its own request")
+    return asyncio.run(run(parser.parse_args(argv)))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
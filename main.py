@@ -1,13 +1,20 @@
 import os
-import json
-import socket
+import re
+import time
 import threading
-import shutil
-import zipfile
-import uuid
 import traceback  # 🔥 ডিবাগিং এর জন্য ইম্পোর্ট করা হলো
 from datetime import datetime
-from flask import Flask, request, jsonify
+
+# কোল্ড স্টার্ট মাপার জন্য: প্রতিটি ধাপ প্রসেস শুরুর কত ms পরে হলো সেটা লগে যায়
+STARTUP_T0 = time.perf_counter()
+
+def startup_mark(label):
+    print(f"DEBUG: [startup] {(time.perf_counter() - STARTUP_T0) * 1000:.0f} ms {label}")
+
+# ব্যাকেন্ড (ইঞ্জিন + Flask API) আলাদা মডিউলে, যাতে Kivy ছাড়াও সার্ভার চালানো যায়
+import backend
+from backend import engine, run_flask, get_ip, detect_format, iter_csv, iter_ndjson
+startup_mark("backend imported")
 
 # 🔥 FIX: লাল ডট (Multi-touch Red Dot) বন্ধ করার কনফিগারেশন
 from kivy.config import Config
@@ -21,16 +28,13 @@ except Exception as e:
 from kivymd.app import MDApp
 from kivymd.uix.screen import Screen
 from kivymd.uix.boxlayout import MDBoxLayout
-from kivymd.uix.list import MDList, OneLineAvatarIconListItem, IconLeftWidget, IconRightWidget, ThreeLineAvatarIconListItem, IRightBodyTouch
-from kivymd.uix.toolbar import MDTopAppBar
+from kivymd.uix.list import MDList, OneLineAvatarIconListItem, TwoLineAvatarIconListItem, IconLeftWidget, ThreeLineAvatarIconListItem, IRightBodyTouch
 from kivymd.uix.dialog import MDDialog
-from kivymd.uix.button import MDRaisedButton, MDFlatButton, MDIconButton, MDFillRoundFlatButton
+from kivymd.uix.button import MDRaisedButton, MDFlatButton, MDIconButton
 from kivymd.uix.textfield import MDTextField
 from kivymd.uix.scrollview import ScrollView
 from kivymd.uix.label import MDLabel
-from kivymd.uix.card import MDCard
-from kivymd.uix.navigationdrawer import MDNavigationLayout, MDNavigationDrawer, MDNavigationDrawerMenu, MDNavigationDrawerItem, MDNavigationDrawerHeader
-from kivymd.uix.filemanager import MDFileManager
+# KV তে ব্যবহৃত বাকি উইজেট (MDCard, MDTopAppBar, MDNavigationLayout ...) KivyMD এর Factory প্রথম ব্যবহারে নিজেই ইম্পোর্ট করে
 from kivy.uix.screenmanager import ScreenManager, FadeTransition
 from kivy.lang import Builder
 from kivy.core.clipboard import Clipboard
@@ -40,6 +44,7 @@ from kivy.properties import StringProperty
 from kivy.core.window import Window
 from kivy.utils import platform
 from kivy.uix.widget import Widget 
+startup_mark("kivy imported")
 
 # কিবোর্ড সমস্যা সমাধান
 Window.softinput_mode = "below_target"
@@ -50,6 +55,12 @@ Window.softinput_mode = "below_target"
 class RightContentCls(IRightBodyTouch, MDBoxLayout):
     adaptive_width = True
 
+def format_size(n):
+    for unit in ("B", "KB", "MB"):
+        if n < 1024: return f"{n:.0f} {unit}" if unit == "B" else f"{n:.1f} {unit}"
+        n /= 1024
+    return f"{n:.1f} GB"
+
 # ==========================================
 # ১. KV ডিজাইন (কালার ও লেআউট)
 # ==========================================
@@ -301,11 +312,21 @@ KV_CODE = '''
         orientation: 'vertical'
         md_bg_color: color_bg_milky
         MDTopAppBar:
-            title: root.table_name
+            title: root.status or root.table_name
             md_bg_color: color_card_white
             specific_text_color: color_primary_blue
             left_action_items: [["arrow-left", lambda x: app.switch_screen('tables')]]
-            right_action_items: [["database-plus", lambda x: root.add_data_dialog()]]
+            right_action_items: [["file-import", lambda x: root.open_import()], ["file-export", lambda x: root.export_file()], ["database-plus", lambda x: root.add_data_dialog()]]
+        MDBoxLayout:
+            size_hint_y: None
+            height: "64dp"
+            padding: "10dp", "4dp"
+            MDTextField:
+                id: search_box
+                hint_text: "Search rows"
+                icon_right: "magnify"
+                mode: "rectangle"
+                on_text_validate: root.do_search(self.text)
         ScrollView:
             MDList:
                 id: data_list
@@ -404,365 +425,10 @@ KV_CODE = '''
                     spacing: "5dp"
 '''
 
-# ==========================================
-# ২. ব্যাকেন্ড ইঞ্জিন (Backend)
-# ==========================================
-server = Flask(__name__)
-SERVER_THREAD_STARTED = False
-SERVER_ACTIVE = False
-CURRENT_USER = None
-
-class BackendEngine:
-    def __init__(self):
-        print("DEBUG: Initializing BackendEngine...")
-        self.root = os.path.abspath("BanglaDB_Data")
-        self.auth_file = os.path.abspath("bangladb_users.json")
-        
-        if platform == 'android':
-            from android.storage import primary_external_storage_path
-            self.backup_dir = os.path.join(primary_external_storage_path(), "BanglaDB_Backups")
-        else:
-            self.backup_dir = os.path.abspath("BanglaDB_Backups")
-        
-        try:
-            if not os.path.exists(self.root): os.makedirs(self.root)
-            if not os.path.exists(self.backup_dir): os.makedirs(self.backup_dir)
-            print(f"DEBUG: Directories created/verified: {self.root}, {self.backup_dir}")
-        except Exception as e:
-            print(f"DEBUG ERROR: Failed to create directories: {e}")
-        
-        # User auth file initialization
-        try:
-            if not os.path.exists(self.auth_file):
-                with open(self.auth_file, 'w') as f: json.dump([], f)
-                print("DEBUG: Created new auth file.")
-            else:
-                try:
-                    with open(self.auth_file, 'r') as f:
-                        data = json.load(f)
-                        if isinstance(data, dict): 
-                             with open(self.auth_file, 'w') as f: json.dump([], f)
-                             print("DEBUG: Reset auth file (was dict, expected list).")
-                except:
-                     with open(self.auth_file, 'w') as f: json.dump([], f)
-                     print("DEBUG: Reset auth file (corrupted).")
-        except Exception as e:
-            print(f"DEBUG ERROR: Auth file init failed: {e}")
-
-    def register_user(self, user, password):
-        print(f"DEBUG: Registering user {user}")
-        try:
-            with open(self.auth_file, 'r') as f: users = json.load(f)
-            for u in users:
-                if u['user'] == user and u['pass'] == password:
-                    print("DEBUG: User already exists")
-                    return False, "This User+Password combination already exists!"
-            
-            unique_id = str(uuid.uuid4())
-            users.append({"user": user, "pass": password, "uid": unique_id})
-            with open(self.auth_file, 'w') as f: json.dump(users, f)
-            
-            user_folder = os.path.join(self.root, unique_id)
-            if not os.path.exists(user_folder): os.makedirs(user_folder)
-            
-            print("DEBUG: Registration success")
-            return True, "Success"
-        except Exception as e:
-            print(f"DEBUG ERROR: Register user failed: {e}")
-            return False, f"Error: {str(e)}"
-
-    def login_user(self, user, password):
-        print(f"DEBUG: Attempting login for {user}")
-        try:
-            with open(self.auth_file, 'r') as f: users = json.load(f)
-            for u in users:
-                if u['user'] == user and u['pass'] == password:
-                    global CURRENT_USER
-                    CURRENT_USER = u
-                    user_folder = os.path.join(self.root, u.get('uid'))
-                    if not os.path.exists(user_folder): os.makedirs(user_folder)
-                    print("DEBUG: Login success")
-                    return True, "Login Success!"
-            print("DEBUG: Login failed - Invalid credentials")
-            return False, "Invalid Credentials"
-        except Exception as e:
-            print(f"DEBUG ERROR: Login failed: {e}")
-            return False, f"Error: {str(e)}"
-
-    def get_user_path(self, target_user_dict=None):
-        user_info = target_user_dict if target_user_dict else CURRENT_USER
-        if user_info and 'uid' in user_info:
-            return os.path.join(self.root, user_info['uid'])
-        return self.root
-
-    # --- CRUD Operations ---
-    def get_databases(self):
-        try:
-            user_path = self.get_user_path()
-            if not os.path.exists(user_path): return []
-            dbs = [f.replace('.json', '') for f in os.listdir(user_path) if f.endswith('.json')]
-            print(f"DEBUG: Found databases: {dbs}")
-            return dbs
-        except Exception as e:
-            print(f"DEBUG ERROR: get_databases failed: {e}")
-            return []
-
-    def create_db(self, name):
-        print(f"DEBUG: Creating DB {name}")
-        try:
-            user_path = self.get_user_path()
-            path = f"{user_path}/{name}.json"
-            if not os.path.exists(path):
-                with open(path, 'w') as f: json.dump({"tables": {}}, f)
-                print("DEBUG: DB Created")
-                return True
-            print("DEBUG: DB Exists")
-            return False
-        except Exception as e:
-            print(f"DEBUG ERROR: create_db failed: {e}")
-            return False
-
-    def rename_db(self, old_name, new_name):
-        print(f"DEBUG: Renaming DB {old_name} to {new_name}")
-        try:
-            user_path = self.get_user_path()
-            old_path = os.path.join(user_path, f"{old_name}.json")
-            new_path = os.path.join(user_path, f"{new_name}.json")
-            if os.path.exists(old_path) and not os.path.exists(new_path):
-                os.rename(old_path, new_path)
-                return True
-            return False
-        except Exception as e:
-            print(f"DEBUG ERROR: rename_db failed: {e}")
-            return False
-
-    def delete_db(self, name):
-        print(f"DEBUG: Deleting DB {name}")
-        try:
-            user_path = self.get_user_path()
-            path = f"{user_path}/{name}.json"
-            if os.path.exists(path): os.remove(path)
-        except Exception as e:
-            print(f"DEBUG ERROR: delete_db failed: {e}")
-
-    def get_tables(self, db, user_obj=None):
-        try:
-            path = f"{self.get_user_path(user_obj)}/{db}.json"
-            with open(path, 'r') as f: return list(json.load(f)["tables"].keys())
-        except Exception as e:
-            print(f"DEBUG ERROR: get_tables failed: {e}")
-            return []
-
-    def create_table(self, db, table, cols, user_obj=None):
-        print(f"DEBUG: Creating table {table} in {db}")
-        try:
-            path = f"{self.get_user_path(user_obj)}/{db}.json"
-            with open(path, 'r') as f: d = json.load(f)
-            if table not in d["tables"]:
-                d["tables"][table] = {"columns": ["id"] + cols, "rows": []}
-                with open(path, 'w') as f: json.dump(d, f, indent=4)
-        except Exception as e:
-            print(f"DEBUG ERROR: create_table failed: {e}")
-
-    def update_table_struct(self, db, old_table_name, new_table_name, new_cols):
-        print(f"DEBUG: Updating table struct {old_table_name} -> {new_table_name}")
-        try:
-            path = f"{self.get_user_path()}/{db}.json"
-            with open(path, 'r') as f: d = json.load(f)
-            
-            if old_table_name in d["tables"]:
-                table_data = d["tables"].pop(old_table_name)
-                
-                if "id" not in new_cols: new_cols.insert(0, "id")
-                table_data["columns"] = new_cols
-                
-                d["tables"][new_table_name] = table_data
-                
-                with open(path, 'w') as f: json.dump(d, f, indent=4)
-                return True
-            return False
-        except Exception as e:
-            print(f"DEBUG ERROR: update_table_struct failed: {e}")
-            return False
-
-    def delete_table(self, db, table):
-        print(f"DEBUG: Deleting table {table}")
-        try:
-            path = f"{self.get_user_path()}/{db}.json"
-            with open(path, 'r') as f: d = json.load(f)
-            if table in d["tables"]:
-                del d["tables"][table]
-                with open(path, 'w') as f: json.dump(d, f, indent=4)
-        except Exception as e:
-            print(f"DEBUG ERROR: delete_table failed: {e}")
-
-    def get_table_data(self, db, table, user_obj=None):
-        try:
-            path = f"{self.get_user_path(user_obj)}/{db}.json"
-            with open(path, 'r') as f:
-                data = json.load(f)["tables"].get(table)
-                if data: return data["columns"], data["rows"]
-        except Exception as e:
-            print(f"DEBUG ERROR: get_table_data failed: {e}")
-        return [], []
-
-    def insert_data(self, db, table, data, user_obj=None):
-        print(f"DEBUG: Inserting data into {table}")
-        try:
-            path = f"{self.get_user_path(user_obj)}/{db}.json"
-            with open(path, 'r') as f: d = json.load(f)
-            rows = d["tables"][table]["rows"]
-            new_id = str(max([int(r.get("id", 0)) for r in rows], default=0) + 1)
-            data["id"] = new_id
-            rows.append(data)
-            with open(path, 'w') as f: json.dump(d, f, indent=4)
-        except Exception as e:
-            print(f"DEBUG ERROR: insert_data failed: {e}")
-
-    def update_row_data(self, db, table, row_id, new_data, user_obj=None):
-        print(f"DEBUG: Updating row {row_id} in {table}")
-        try:
-            path = f"{self.get_user_path(user_obj)}/{db}.json"
-            with open(path, 'r') as f: d = json.load(f)
-            rows = d["tables"][table]["rows"]
-            
-            for i, row in enumerate(rows):
-                if str(row.get("id")) == str(row_id):
-                    new_data["id"] = row_id
-                    rows[i] = new_data
-                    with open(path, 'w') as f: json.dump(d, f, indent=4)
-                    return True
-            return False
-        except Exception as e:
-            print(f"DEBUG ERROR: update_row_data failed: {e}")
-            return False
-
-    def delete_data(self, db, table, row_id):
-        print(f"DEBUG: Deleting row {row_id} from {table}")
-        try:
-            path = f"{self.get_user_path()}/{db}.json"
-            with open(path, 'r') as f: d = json.load(f)
-            d["tables"][table]["rows"] = [r for r in d["tables"][table]["rows"] if str(r.get("id")) != str(row_id)]
-            with open(path, 'w') as f: json.dump(d, f, indent=4)
-        except Exception as e:
-            print(f"DEBUG ERROR: delete_data failed: {e}")
-
-    # --- Backup System ---
-    def create_backup(self, db_name=None):
-        print(f"DEBUG: Creating backup for {db_name}")
-        try:
-            ts = datetime.now().strftime("%Y%m%d_%H%M%S")
-            user_path = self.get_user_path()
-            
-            if db_name and db_name != "ALL":
-                source_file = os.path.join(user_path, f"{db_name}.json")
-                if not os.path.exists(source_file): return "Database not found!"
-                
-                zip_filename = f"{CURRENT_USER['user']}_{db_name}_{ts}.zip"
-                save_path = os.path.join(self.backup_dir, zip_filename)
-                
-                with zipfile.ZipFile(save_path, 'w', zipfile.ZIP_DEFLATED) as zf:
-                    zf.write(source_file, arcname=f"{db_name}.json")
-                return f"Backup Saved!\nLocation:\n{save_path}"
-            else:
-                base_name = f"{CURRENT_USER['user']}_FULL_{ts}.zip"
-                save_path = os.path.join(self.backup_dir, base_name)
-                
-                with zipfile.ZipFile(save_path, 'w', zipfile.ZIP_DEFLATED) as zf:
-                    for root, dirs, files in os.walk(user_path):
-                        for file in files:
-                            file_path = os.path.join(root, file)
-                            zf.write(file_path, arcname=file)
-                return f"Full Backup Saved!\nLocation:\n{save_path}"
-        except Exception as e:
-            print(f"DEBUG ERROR: create_backup failed: {e}")
-            return f"Error: {str(e)}"
-
-    def get_backups(self):
-        try:
-            return [f for f in os.listdir(self.backup_dir) if f.endswith('.zip')]
-        except Exception as e:
-            print(f"DEBUG ERROR: get_backups failed: {e}")
-            return []
-
-    def restore_backup(self, filepath):
-        print(f"DEBUG: Restoring backup from {filepath}")
-        try:
-            target_path = self.get_user_path()
-            with zipfile.ZipFile(filepath, 'r') as zip_ref:
-                zip_ref.extractall(target_path)
-            return True, "Restore Successful!"
-        except Exception as e:
-            print(f"DEBUG ERROR: restore_backup failed: {e}")
-            return False, str(e)
-            
-    def authenticate_api_user(self, user, password):
-        try:
-            with open(self.auth_file, 'r') as f: users = json.load(f)
-            for u in users:
-                if u['user'] == user and u['pass'] == password:
-                    if 'uid' not in u: u['uid'] = str(uuid.uuid4())
-                    return u
-        except Exception as e:
-            print(f"DEBUG ERROR: authenticate_api_user failed: {e}")
-        return None
-
-try:
-    engine = BackendEngine()
-except Exception as e:
-    print(f"DEBUG CRITICAL: Engine Init Failed: {e}")
-    traceback.print_exc()
-
-# --- FLASK API ---
-@server.route('/api', methods=['POST'])
-def api_handler():
-    if not SERVER_ACTIVE: return jsonify({"status": "error", "msg": "Server is Stopped"}), 503
-    try:
-        data = request.json
-        user_obj = engine.authenticate_api_user(data.get('user'), data.get('pass'))
-        
-        if not user_obj:
-            return jsonify({"status": "error", "msg": "Auth Failed"}), 401
-        
-        action = data.get('action')
-        db, table = data.get('db'), data.get('table')
-        
-        if action == "get":
-            c, r = engine.get_table_data(db, table, user_obj=user_obj)
-            rows_list = [[r.get(col, "") for col in c] for r in r]
-            return jsonify({"status": "success", "columns": c, "data": rows_list})
-        elif action == "insert":
-            engine.insert_data(db, table, data.get('row'), user_obj=user_obj)
-            return jsonify({"status": "success"})
-        elif action == "update":
-            row_id = data.get('id')
-            new_data = data.get('data')
-            if engine.update_row_data(db, table, row_id, new_data, user_obj=user_obj):
-                return jsonify({"status": "success", "msg": "Updated"})
-            else:
-                return jsonify({"status": "error", "msg": "ID not found"})
-                
-        return jsonify({"status": "error", "msg": "Invalid Action"})
-    except Exception as e:
-        print(f"DEBUG ERROR: API Handler failed: {e}")
-        return jsonify({"status": "error", "msg": str(e)})
-
-def run_flask():
-    print("DEBUG: Starting Flask Server...")
-    try:
-        server.run(host='0.0.0.0', port=5000)
-    except Exception as e:
-        print(f"DEBUG CRITICAL: Flask Server Failed: {e}")
-
-def get_ip():
-    try:
-        s = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
-        s.connect(("8.8.8.8", 80))
-        ip = s.getsockname()[0]; s.close()
-        return ip
-    except Exception as e:
-        print(f"DEBUG ERROR: get_ip failed: {e}")
-        return "127.0.0.1"
+# প্রতিটি স্ক্রিনের KV রুল আলাদা করা হয়, যাতে স্ক্রিনটা প্রথমবার খোলার সময়ই শুধু পার্স হয়
+_kv_parts = re.split(r"(?m)^(?=<\w+Screen>:)", KV_CODE)
+KV_BASE = _kv_parts[0]
+KV_RULES = {re.match(r"<(\w+)>", part).group(1): part for part in _kv_parts[1:]}
 
 # ==========================================
 # ৩. UI Logic (Screens)
@@ -813,9 +479,13 @@ class HomeScreen(Screen):
         print("DEBUG: Loading Databases to List")
         try:
             self.ids.db_list_view.clear_widgets()
+            # সংখ্যা গুলো ক্যাটালগ থেকে — কোনো ডাটাবেস ফাইল খোলা হয় না
+            stats = engine.get_stats()
             for db in engine.get_databases():
-                item = OneLineAvatarIconListItem(
+                info = stats.get(db, {"tables": {}, "bytes": 0})
+                item = TwoLineAvatarIconListItem(
                     text=db, 
+                    secondary_text=f"{len(info['tables'])} tables · {format_size(info['bytes'])}",
                     bg_color=(1,1,1,1), 
                     on_release=lambda x, d=db: MDApp.get_running_app().open_table_screen(d)
                 )
@@ -854,17 +524,16 @@ class HomeScreen(Screen):
         self.dialog.open()
     
     def toggle_server(self):
-        global SERVER_ACTIVE, SERVER_THREAD_STARTED
-        print(f"DEBUG: Toggling Server. Current State: {SERVER_ACTIVE}")
+        print(f"DEBUG: Toggling Server. Current State: {backend.SERVER_ACTIVE}")
         btn = self.ids.btn_server; lbl = self.ids.lbl_ip
-        if not SERVER_ACTIVE:
-            if not SERVER_THREAD_STARTED: 
+        if not backend.SERVER_ACTIVE:
+            if not backend.SERVER_THREAD_STARTED: 
                 threading.Thread(target=run_flask, daemon=True).start()
-                SERVER_THREAD_STARTED = True
+                backend.SERVER_THREAD_STARTED = True
                 print("DEBUG: Server Thread Started")
-            SERVER_ACTIVE = True; btn.text = "STOP SERVER"; btn.md_bg_color = (1, 0.2, 0.2, 1); lbl.text = f"RUNNING: {get_ip()}:5000"; lbl.text_color = (0, 0.8, 0.3, 1)
+            backend.SERVER_ACTIVE = True; btn.text = "STOP SERVER"; btn.md_bg_color = (1, 0.2, 0.2, 1); lbl.text = f"RUNNING: {get_ip()}:5000"; lbl.text_color = (0, 0.8, 0.3, 1)
         else:
-            SERVER_ACTIVE = False; btn.text = "START SERVER"; btn.md_bg_color = (0, 0.8, 0.3, 1); lbl.text = "SERVER: STOPPED"; lbl.text_color = (1, 0.2, 0.2, 1)
+            backend.SERVER_ACTIVE = False; btn.text = "START SERVER"; btn.md_bg_color = (0, 0.8, 0.3, 1); lbl.text = "SERVER: STOPPED"; lbl.text_color = (1, 0.2, 0.2, 1)
 
     def show_create_db_dialog(self):
         self.tf = MDTextField(hint_text="Database Name")
@@ -882,9 +551,11 @@ class TableScreen(Screen):
         print(f"DEBUG: TableScreen Entered for DB: {self.db_name}")
         self.ids.table_list.clear_widgets()
         try:
+            tables = engine.get_stats(self.db_name).get(self.db_name, {}).get("tables", {})
             for t in engine.get_tables(self.db_name):
-                item = OneLineAvatarIconListItem(
+                item = TwoLineAvatarIconListItem(
                     text=t, 
+                    secondary_text=f"{tables.get(t, {}).get('rows', 0)} rows",
                     bg_color=(1,1,1,1), 
                     on_release=lambda x, table=t: MDApp.get_running_app().open_data_screen(self.db_name, table)
                 )
@@ -911,11 +582,12 @@ class TableScreen(Screen):
 
     def show_edit_table_dialog(self, old_table_name):
         c, _ = engine.get_table_data(self.db_name, old_table_name)
-        cols_str = ",".join([col for col in c if col != 'id'])
+        types = engine.get_table_types(self.db_name, old_table_name)
+        cols_str = ",".join([f"{col}:{types[col]}" if col in types else col for col in c if col != 'id'])
         
         self.bx = MDBoxLayout(orientation="vertical", size_hint_y=None, height="120dp")
         self.tf_name_edit = MDTextField(text=old_table_name, hint_text="Table Name")
-        self.tf_cols_edit = MDTextField(text=cols_str, hint_text="Columns (comma separated)")
+        self.tf_cols_edit = MDTextField(text=cols_str, hint_text="Columns (name,age:int, old->new to rename)")
         self.bx.add_widget(self.tf_name_edit)
         self.bx.add_widget(self.tf_cols_edit)
         
@@ -931,7 +603,7 @@ class TableScreen(Screen):
         self.dialog.open()
 
     def add_table_dialog(self):
-        self.bx = MDBoxLayout(orientation="vertical", size_hint_y=None, height="120dp"); self.tf_name = MDTextField(hint_text="Table Name"); self.tf_cols = MDTextField(hint_text="Cols (name,age)")
+        self.bx = MDBoxLayout(orientation="vertical", size_hint_y=None, height="120dp"); self.tf_name = MDTextField(hint_text="Table Name"); self.tf_cols = MDTextField(hint_text="Cols (name,age:int)")
         self.bx.add_widget(self.tf_name); self.bx.add_widget(self.tf_cols)
         self.create_dialog = MDDialog(title="New Table", type="custom", content_cls=self.bx, 
                                       buttons=[MDRaisedButton(text="CREATE", on_release=lambda x: (engine.create_table(self.db_name, self.tf_name.text, self.tf_cols.text.split(',')), self.on_enter(), self.create_dialog.dismiss())), 
@@ -940,42 +612,56 @@ class TableScreen(Screen):
 
 class DataScreen(Screen):
     db_name = StringProperty(""); table_name = StringProperty("")
+    status = StringProperty("")
     dialog = None
     create_dialog = None
+    file_manager = None
     
     def on_enter(self):
         print(f"DEBUG: DataScreen Entered for Table: {self.table_name}")
-        self.ids.data_list.clear_widgets()
+        self.ids.search_box.text = ""
         try:
             cols, rows = engine.get_table_data(self.db_name, self.table_name)
-            if not rows: self.ids.data_list.add_widget(MDLabel(text="No Data Found", halign="center")); return
-                
-            for r in rows:
-                row_id = r.get("id", "?")
-                all_data = " | ".join([f"{k}:{v}" for k,v in r.items() if k != 'id'])
-                
-                item = ThreeLineAvatarIconListItem(text=f"ID: {row_id}", secondary_text=all_data, bg_color=(1,1,1,1))
-                item.add_widget(IconLeftWidget(icon="text-box-outline", theme_text_color="Custom", text_color=(0, 0.48, 1, 1)))
-                
-                right_container = RightContentCls(spacing=dp(15))
-                
-                edit_btn = MDIconButton(icon="pencil", theme_text_color="Custom", text_color=(1, 0.75, 0, 1), pos_hint={"center_y": .5})
-                edit_btn.bind(on_release=lambda x, d=r: self.show_edit_row_dialog(d))
-                
-                del_btn = MDIconButton(icon="trash-can", theme_text_color="Custom", text_color=(1, 0.2, 0.2, 1), pos_hint={"center_y": .5})
-                del_btn.bind(on_release=lambda x, rid=row_id: self.confirm_delete(rid))
-                
-                spacer = Widget(size_hint_x=None, width=dp(15))
-                
-                right_container.add_widget(edit_btn)
-                right_container.add_widget(del_btn)
-                right_container.add_widget(spacer)
-                
-                item.add_widget(right_container)
-                self.ids.data_list.add_widget(item)
+            self.show_rows(cols, rows)
         except Exception as e:
             print(f"DEBUG ERROR: Row load failed: {e}")
 
+    def do_search(self, q):
+        if not q.strip(): return self.on_enter()
+        try:
+            cols, hits = engine.search_rows(self.db_name, self.table_name, q, limit=100)
+            self.show_rows(cols, [r for r, _ in hits], empty_text="No Match Found")
+        except Exception as e:
+            print(f"DEBUG ERROR: Search failed: {e}")
+
+    def show_rows(self, cols, rows, empty_text="No Data Found"):
+        self.ids.data_list.clear_widgets()
+        if not rows: self.ids.data_list.add_widget(MDLabel(text=empty_text, halign="center")); return
+            
+        for r in rows:
+            row_id = r.get("id", "?")
+            all_data = " | ".join([f"{k}:{r.get(k)}" for k in cols if k != 'id'])
+            
+            item = ThreeLineAvatarIconListItem(text=f"ID: {row_id}", secondary_text=all_data, bg_color=(1,1,1,1))
+            item.add_widget(IconLeftWidget(icon="text-box-outline", theme_text_color="Custom", text_color=(0, 0.48, 1, 1)))
+            
+            right_container = RightContentCls(spacing=dp(15))
+            
+            edit_btn = MDIconButton(icon="pencil", theme_text_color="Custom", text_color=(1, 0.75, 0, 1), pos_hint={"center_y": .5})
+            edit_btn.bind(on_release=lambda x, d=r: self.show_edit_row_dialog(d))
+            
+            del_btn = MDIconButton(icon="trash-can", theme_text_color="Custom", text_color=(1, 0.2, 0.2, 1), pos_hint={"center_y": .5})
+            del_btn.bind(on_release=lambda x, rid=row_id: self.confirm_delete(rid))
+            
+            spacer = Widget(size_hint_x=None, width=dp(15))
+            
+            right_container.add_widget(edit_btn)
+            right_container.add_widget(del_btn)
+            right_container.add_widget(spacer)
+            
+            item.add_widget(right_container)
+            self.ids.data_list.add_widget(item)
+
     def show_edit_row_dialog(self, row_data):
         c, _ = engine.get_table_data(self.db_name, self.table_name)
         dialog_height = dp(60 * (len(c) - 1)) if len(c) > 1 else dp(100)
@@ -984,15 +670,68 @@ class DataScreen(Screen):
         
         for col in c:
             if col == 'id': continue
-            tf = MDTextField(text=str(row_data.get(col, "")), hint_text=col)
+            val = row_data.get(col)
+            tf = MDTextField(text="" if val is None else str(val), hint_text=col)
             self.inputs[col] = tf
             self.bx.add_widget(tf)
             
         self.dialog = MDDialog(title=f"Edit Row ID: {row_data.get('id')}", type="custom", content_cls=self.bx,
-                               buttons=[MDRaisedButton(text="UPDATE", on_release=lambda x: (engine.update_row_data(self.db_name, self.table_name, row_data.get('id'), {k: v.text for k,v in self.inputs.items()}), self.on_enter(), self.dialog.dismiss())),
+                               buttons=[MDRaisedButton(text="UPDATE", on_release=lambda x: self.save_row(self.dialog, row_data.get('id'))),
                                         MDFlatButton(text="CANCEL", on_release=lambda x: self.dialog.dismiss())])
         self.dialog.open()
 
+    def save_row(self, dialog, row_id=None):
+        values = {k: v.text for k,v in self.inputs.items()}
+        if row_id is None: ok, msg = engine.insert_data(self.db_name, self.table_name, values)
+        else: ok, msg = engine.update_row_data(self.db_name, self.table_name, row_id, values)
+        dialog.dismiss()
+        self.on_enter()
+        if not ok: self.show_message(msg)
+
+    def show_message(self, msg):
+        self.dialog = MDDialog(text=msg, buttons=[MDFlatButton(text="OK", on_release=lambda x: self.dialog.dismiss())])
+        self.dialog.open()
+
+    def open_import(self):
+        if not self.file_manager:
+            from kivymd.uix.filemanager import MDFileManager
+            self.file_manager = MDFileManager(exit_manager=self.close_import, select_path=self.import_file, ext=['.csv', '.ndjson', '.jsonl'])
+        self.file_manager.show("/storage/emulated/0" if platform == 'android' else os.path.expanduser("~"))
+
+    def close_import(self, *args):
+        if self.file_manager: self.file_manager.close()
+
+    def import_file(self, path):
+        self.close_import()
+        db, table = self.db_name, self.table_name
+        def report(summary):
+            Clock.schedule_once(lambda dt, n=summary["inserted"]: setattr(self, "status", f"Importing... {n} rows"))
+        def run():
+            try:
+                fmt = detect_format(filename=path)
+                with open(path, 'rb') as f:
+                    records = iter_csv(f) if fmt == "csv" else iter_ndjson(f)
+                    summary = engine.import_rows(db, table, records, progress=report)
+                msg = f"Imported {summary['inserted']} rows"
+                if summary["failed"]: msg += f", {summary['failed']} skipped\n" + "\n".join(summary["errors"])
+            except Exception as e:
+                print(f"DEBUG ERROR: Import failed: {e}")
+                msg = f"Import failed: {e}"
+            Clock.schedule_once(lambda dt: (setattr(self, "status", ""), self.on_enter(), self.show_message(msg)))
+        self.status = "Importing..."
+        threading.Thread(target=run, daemon=True).start()
+
+    def export_file(self, fmt="csv"):
+        try:
+            ts = datetime.now().strftime("%Y%m%d_%H%M%S")
+            path = os.path.join(engine.backup_dir, f"{self.db_name}_{self.table_name}_{ts}.{fmt}")
+            with open(path, 'w', encoding='utf-8', newline='') as f:
+                for chunk in engine.export_rows(self.db_name, self.table_name, fmt): f.write(chunk)
+            self.show_message(f"Exported!\nLocation:\n{path}")
+        except Exception as e:
+            print(f"DEBUG ERROR: Export failed: {e}")
+            self.show_message(f"Export failed: {e}")
+
     def confirm_delete(self, row_id):
         self.dialog = MDDialog(title="Delete Row?", text=f"Delete ID: {row_id}?", 
                                buttons=[MDRaisedButton(text="DELETE", md_bg_color="red", on_release=lambda x: (engine.delete_data(self.db_name, self.table_name, row_id), self.on_enter(), self.dialog.dismiss())), 
@@ -1006,7 +745,7 @@ class DataScreen(Screen):
         self.inputs = {col: MDTextField(hint_text=col) for col in c if col != 'id'}
         for w in self.inputs.values(): self.bx.add_widget(w)
         self.create_dialog = MDDialog(title="Add Data", type="custom", content_cls=self.bx, 
-                                      buttons=[MDRaisedButton(text="SAVE", on_release=lambda x: (engine.insert_data(self.db_name, self.table_name, {k: v.text for k,v in self.inputs.items()}), self.on_enter(), self.create_dialog.dismiss())), 
+                                      buttons=[MDRaisedButton(text="SAVE", on_release=lambda x: self.save_row(self.create_dialog)), 
                                                MDFlatButton(text="CANCEL", on_release=lambda x: self.create_dialog.dismiss())])
         self.create_dialog.open()
 
@@ -1029,15 +768,32 @@ class ConnectionScreen(Screen):
     def set_db(self, db): self.selected_db = db; self.ids.btn_sel.text = f"SELECTED: {db}"; self.dialog.dismiss()
     def gen_info(self):
         if not self.selected_db: return
-        ip = get_ip(); u=CURRENT_USER['user']; p=CURRENT_USER['pass']
-        code = f"""<?php
+        ip = get_ip(); u=backend.CURRENT_USER['user']; p=backend.CURRENT_USER['pass']
+        php = f"""<?php
 $url = "http://{ip}:5000/api";
 $data = array("user"=>"{u}", "pass"=>"{p}", "db"=>"{self.selected_db}", "action"=>"get", "table"=>"YOUR_TABLE");
 $options = array("http"=>array("header"=>"Content-type: application/json", "method"=>"POST", "content"=>json_encode($data)));
 $result = file_get_contents($url, false, stream_context_create($options));
 echo $result;
 ?>"""
-        self.ids.res_lbl.text = f"HOST: {ip}:5000\nUser: {u}\nPass: {p}\nDB: {self.selected_db}\n(Code Copied)"; Clipboard.copy(code)
+        py = f"""# bangladb_client.py: keep-alive কানেকশন, ব্যাচ রাইট, রিট্রাই
+from bangladb_client import Client
+with Client("http://{ip}:5000", "{u}", "{p}") as db:
+    rows = db.get("{self.selected_db}", "YOUR_TABLE")
+    db.insert_later("{self.selected_db}", "YOUR_TABLE", {{"name": "..."}})
+"""
+        self.info = f"HOST: {ip}:5000\nUser: {u}\nPass: {p}\nDB: {self.selected_db}"; self.ids.res_lbl.text = self.info
+        # দুই ভাষার কোড আলাদা আলাদা কপি হয়, যাতে ক্লিপবোর্ডে শুধু একটাই থাকে
+        self.dialog = MDDialog(title="Copy Code", text="Which client code should be copied?",
+                               buttons=[MDRaisedButton(text="PHP", on_release=lambda x: self.copy_code(php, "PHP")),
+                                        MDRaisedButton(text="PYTHON", on_release=lambda x: self.copy_code(py, "Python")),
+                                        MDFlatButton(text="CLOSE", on_release=lambda x: self.dialog.dismiss())])
+        self.dialog.open()
+
+    def copy_code(self, code, lang):
+        Clipboard.copy(code)
+        self.ids.res_lbl.text = f"{self.info}\n({lang} Code Copied)"
+        self.dialog.dismiss()
 
 class BackupScreen(Screen):
     dialog = None
@@ -1092,6 +848,7 @@ class BackupScreen(Screen):
         if not self.file_manager:
             path = os.path.expanduser("~")
             if platform == 'android': path = "/storage/emulated/0"
+            from kivymd.uix.filemanager import MDFileManager
             self.file_manager = MDFileManager(exit_manager=self.exit_manager, select_path=self.select_path, ext=['.zip'])
         self.file_manager.show(os.path.expanduser("~"))
 
@@ -1104,25 +861,26 @@ class BackupScreen(Screen):
     def exit_manager(self, *args):
         if self.file_manager: self.file_manager.close()
 
+SCREENS = {"login": AuthScreen, "register": RegisterScreen, "home": HomeScreen, "tables": TableScreen,
+           "data": DataScreen, "connect": ConnectionScreen, "backup": BackupScreen}
+
 class BanglaDBApp(MDApp):
     def build(self):
         print("DEBUG: Building App Layout")
-        Builder.load_string(KV_CODE)
+        startup_mark("build")
+        Builder.load_string(KV_BASE)
         self.theme_cls.theme_style = "Light"
         self.theme_cls.primary_palette = "Blue"
         self.sm = ScreenManager(transition=FadeTransition())
-        self.sm.add_widget(AuthScreen(name="login"))
-        self.sm.add_widget(RegisterScreen(name="register"))
-        self.sm.add_widget(HomeScreen(name="home"))
-        self.sm.add_widget(TableScreen(name="tables"))
-        self.sm.add_widget(DataScreen(name="data"))
-        self.sm.add_widget(ConnectionScreen(name="connect"))
-        self.sm.add_widget(BackupScreen(name="backup"))
+        # শুরুতে শুধু লগইন স্ক্রিন; বাকিগুলো প্রথমবার যাওয়ার সময় তৈরি হয় (get_screen)
+        self.switch_screen("login")
+        startup_mark("login screen built")
         return self.sm
 
     # 🔥 FIX: অ্যাপ চালু হওয়ার সময় পারমিশন চাওয়া
     def on_start(self):
         print("DEBUG: App Started")
+        Clock.schedule_once(self._first_frame, 0)
         if platform == 'android':
             try:
                 from android.permissions import request_permissions, Permission
@@ -1135,10 +893,32 @@ class BanglaDBApp(MDApp):
             except Exception as e:
                 print(f"DEBUG CRITICAL: Permission Request Failed: {e}")
 
-    def switch_screen(self, name): self.sm.current = name
-    def open_table_screen(self, db): self.sm.get_screen("tables").db_name = db; self.switch_screen("tables")
-    def open_data_screen(self, db, t): s=self.sm.get_screen("data"); s.db_name=db; s.table_name=t; self.switch_screen("data")
-    def logout(self): global CURRENT_USER; CURRENT_USER=None; self.switch_screen("login")
+    def _first_frame(self, dt):
+        startup_mark("first frame")
+        # ইউজার লগইন টাইপ করার সময়েই ইঞ্জিন ব্যাকগ্রাউন্ডে তৈরি হয়ে থাকে
+        threading.Thread(target=engine.ready, daemon=True).start()
+
+    def on_pause(self):
+        engine.flush()
+        return True
+
+    def on_stop(self):
+        engine.shutdown()
+
+    def get_screen(self, name):
+        # প্রথম ব্যবহারে KV রুল লোড করে স্ক্রিন বানায়
+        if not self.sm.has_screen(name):
+            t = time.perf_counter()
+            cls = SCREENS[name]
+            Builder.load_string(KV_RULES[cls.__name__])
+            self.sm.add_widget(cls(name=name))
+            print(f"DEBUG: Built screen {name} in {(time.perf_counter() - t) * 1000:.0f} ms")
+        return self.sm.get_screen(name)
+
+    def switch_screen(self, name): self.get_screen(name); self.sm.current = name
+    def open_table_screen(self, db): self.get_screen("tables").db_name = db; self.switch_screen("tables")
+    def open_data_screen(self, db, t): s=self.get_screen("data"); s.db_name=db; s.table_name=t; self.switch_screen("data")
+    def logout(self): backend.CURRENT_USER=None; self.switch_screen("login")
 
 if __name__ == "__main__":
     try:
@@ -0,0 +1,29 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import backend  # noqa: E402
+
+
+@pytest.fixture
+def engine(tmp_path, monkeypatch):
+    # প্রতিটা টেস্টের নিজস্ব ডাটা ফোল্ডার; ফ্লাস্ক রুটগুলো মডিউলের engine ব্যবহার করে, তাই সেটাই বদলানো হয়
+    eng = backend.BackendEngine(str(tmp_path))
+    monkeypatch.setattr(backend, "engine", eng)
+    monkeypatch.setattr(backend, "SERVER_ACTIVE", True)
+    eng.register_user("u", "p")
+    yield eng
+    eng.shutdown()
+
+
+@pytest.fixture
+def user(engine):
+    return engine.authenticate_api_user("u", "p")
+
+
+@pytest.fixture
+def client(engine):
+    return backend.server.test_client()
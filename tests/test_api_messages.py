@@ -0,0 +1,21 @@
+AUTH = {"user": "u", "pass": "p"}
+
+
+def api(client, **body):
+    return client.post("/api", json=dict(AUTH, db="s", **body)).get_json()
+
+
+def test_field_op_coercion_error_names_the_column(client, engine, user):
+    engine.create_db("s", user)
+    engine.create_table("s", "t", ["n:int"], user)
+    ok, row_id = engine.insert_data("s", "t", {"n": 101}, user)
+    res = api(client, table="t", action="incr", id=row_id, column="n", value=0.5)
+    assert res["status"] == "error"
+    assert res["msg"] == "Column 'n' expects int, got 101.5"
+
+
+def test_aggregate_missing_table_is_table_not_found(client, engine, user):
+    engine.create_db("s", user)
+    assert api(client, table="nope", action="aggregate", aggs=["count"]) == {"status": "error", "msg": "Table not found"}
+    res = client.post("/api", json=dict(AUTH, db="nodb", table="t", action="aggregate", aggs=["count"])).get_json()
+    assert res == {"status": "error", "msg": "Table not found"}
@@ -0,0 +1,43 @@
+import gzip
+import json
+
+import pytest
+
+CORRUPT_GZIP = b"\x1f\x8b\x08\x00not really gzip"
+AUTH = {"user": "u", "pass": "p"}
+
+
+@pytest.mark.parametrize("route", ["/api", "/api/changes", "/api/replication/log", "/api/replication/snapshot"])
+def test_corrupt_gzip_body_is_400(client, route):
+    r = client.post(route, data=CORRUPT_GZIP, headers={"Content-Type": "application/json", "Content-Encoding": "gzip"})
+    assert r.status_code == 400
+    assert r.get_json()["status"] == "error"
+
+
+@pytest.mark.parametrize("route", ["/api", "/api/changes", "/api/replication/log", "/api/replication/snapshot"])
+def test_bad_json_body_is_400(client, route):
+    r = client.post(route, data=b"{not json", headers={"Content-Type": "application/json"})
+    assert r.status_code == 400
+    assert r.get_json()["status"] == "error"
+
+
+def test_corrupt_gzip_import_is_400(client):
+    r = client.post("/api/import?db=s&table=t&format=ndjson", data=CORRUPT_GZIP,
+                    headers={"Content-Encoding": "gzip", "X-BanglaDB-User": "u", "X-BanglaDB-Pass": "p"})
+    assert r.status_code == 400
+
+
+def test_valid_gzip_body_still_works(client, engine, user):
+    engine.create_db("s", user)
+    body = gzip.compress(json.dumps(dict(AUTH, action="stats")).encode())
+    r = client.post("/api/replication/snapshot", data=body, headers={"Content-Type": "application/json", "Content-Encoding": "gzip"})
+    assert r.status_code == 200
+    assert r.get_json()["dbs"] == ["s"]
+
+
+def test_changes_stream_bad_cursor_answers_like_changes(client):
+    stream = client.get("/api/changes/stream?user=u&pass=p&db=s&table=t&since=abc")
+    poll = client.post("/api/changes", json=dict(AUTH, db="s", table="t", since="abc"))
+    assert stream.status_code == poll.status_code == 200
+    assert stream.get_json() == poll.get_json()
+    assert stream.get_json()["status"] == "error"
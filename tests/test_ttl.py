@@ -0,0 +1,38 @@
+import time
+
+import pytest
+
+
+@pytest.fixture
+def ttl_table(engine, user):
+    engine.create_db("s", user)
+    engine.create_table("s", "t", ["name", "ts"], user)
+    assert engine.set_ttl("s", "t", 10, "ts", user)[0]
+    return engine
+
+
+def names(engine, user):
+    return sorted(r["name"] for r in engine.read_table("s", "t", user_obj=user)["rows"])
+
+
+def test_rename_keeps_ttl_column(ttl_table, user):
+    assert ttl_table.rename_column("s", "t", "ts", "created", user)[0]
+    with ttl_table._read(ttl_table._db_path("s", user)) as d:
+        assert d["tables"]["t"]["ttl"]["column"] == "created"
+    ttl_table.insert_data("s", "t", {"name": "old", "created": time.time() - 100}, user)
+    ttl_table.insert_data("s", "t", {"name": "new", "created": time.time()}, user)
+    assert names(ttl_table, user) == ["new"]
+
+
+def test_rename_through_update_table_struct(ttl_table, user):
+    assert ttl_table.update_table_struct("s", "t", "t", ["name", "ts->created"], user_obj=user)
+    ttl_table.insert_data("s", "t", {"name": "old", "created": time.time() - 100}, user)
+    assert names(ttl_table, user) == []
+
+
+def test_drop_ttl_column_is_rejected(ttl_table, user):
+    ok, msg = ttl_table.drop_column("s", "t", "ts", user)
+    assert not ok and "TTL" in msg
+    assert "ts" in ttl_table.read_table("s", "t", user_obj=user)["columns"]
+    assert ttl_table.set_ttl("s", "t", user_obj=user)[0]
+    assert ttl_table.drop_column("s", "t", "ts", user)[0]